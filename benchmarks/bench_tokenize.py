@@ -0,0 +1,93 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from zoon.decoder import _tokenize_row
+
+
+def _char_scan_tokenize(line: str) -> list[str]:
+    # The original character-by-character scanner, kept as the baseline
+    tokens = []
+    i = 0
+    while i < len(line):
+        while i < len(line) and line[i] == ' ':
+            i += 1
+        if i >= len(line):
+            break
+        if line[i] == '"':
+            end = i + 1
+            while end < len(line):
+                if line[end] == '\\' and end + 1 < len(line):
+                    end += 2
+                elif line[end] == '"':
+                    end += 1
+                    break
+                else:
+                    end += 1
+            tokens.append(line[i+1:end-1])
+            i = end
+        elif line[i] == '[':
+            end = i + 1
+            while end < len(line) and line[end] != ']':
+                end += 1
+            tokens.append(line[i:end+1])
+            i = end + 1
+        else:
+            end = i
+            while end < len(line) and line[end] != ' ':
+                end += 1
+            tokens.append(line[i:end])
+            i = end
+    return tokens
+
+
+def make_rows(count: int, quoted_ratio: float, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    levels = ["0", "1", "2", "3"]
+    rows = []
+    for i in range(count):
+        cells = [
+            str(1700000000 + i), rng.choice(levels), f"svc-{rng.randint(1, 40)}",
+            str(rng.randint(100, 599)), f"{rng.random() * 900:.3f}", rng.choice(["0", "1"]),
+        ]
+        if rng.random() < quoted_ratio:
+            cells.append('"request failed: upstream \\"api\\" timed out after retry"')
+            cells.append("[a,b,c]")
+        else:
+            cells.append(f"/api/v1/items/{rng.randint(1, 9999)}")
+        rows.append(" ".join(cells))
+    return rows
+
+
+def bench(tokenize, rows: list[str]) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        tokenize(row)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Row tokenizer micro-benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--quoted-ratio", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows, args.quoted_ratio)
+    for row in rows[:1000]:
+        assert _tokenize_row(row) == _char_scan_tokenize(row)
+
+    baseline = bench(_char_scan_tokenize, rows)
+    current = bench(_tokenize_row, rows)
+    print(f"rows={args.rows} quoted_ratio={args.quoted_ratio}")
+    print(f"char scan: {baseline:.3f}s ({args.rows / baseline:,.0f} rows/s)")
+    print(f"tokenizer: {current:.3f}s ({args.rows / current:,.0f} rows/s)")
+    print(f"speedup:   {baseline / current:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
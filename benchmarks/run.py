@@ -0,0 +1,180 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import zoon
+from synthetic import DATASETS
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _best_times(funcs: list, repeat: int) -> list[float]:
+    # Round-robin so every function sees the same machine load; the garbage
+    # collector is paused while timing, as timeit does
+    best = [float("inf")] * len(funcs)
+    enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            for i, func in enumerate(funcs):
+                gc.collect()
+                gc.disable()
+                start = time.perf_counter()
+                func()
+                best[i] = min(best[i], time.perf_counter() - start)
+                gc.enable()
+    finally:
+        if enabled:
+            gc.enable()
+        else:
+            gc.disable()
+    return best
+
+
+def _peak_memory(func) -> int:
+    # Measured in its own run: tracemalloc slows everything down
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name: str, rows: int, repeat: int, memory: bool, tokenizer) -> dict:
+    data = DATASETS[name](rows)
+    encoded = zoon.encode(data)
+    as_json = json.dumps(data, separators=(",", ":"))
+    # The json module on the same data and machine is the yardstick that
+    # makes timings comparable across runs and machines
+    encode_time, decode_time, dumps_time, loads_time = _best_times([
+        lambda: zoon.encode(data),
+        lambda: zoon.decode(encoded),
+        lambda: json.dumps(data, separators=(",", ":")),
+        lambda: json.loads(as_json),
+    ], repeat)
+    zoon_tokens = zoon.count_tokens(encoded, tokenizer)
+    json_tokens = zoon.count_tokens(as_json, tokenizer)
+
+    result = {
+        "dataset": name,
+        "rows": rows,
+        "encode_rows_per_sec": round(rows / encode_time),
+        "decode_rows_per_sec": round(rows / decode_time),
+        "encode_vs_json": round(encode_time / dumps_time, 3),
+        "decode_vs_json": round(decode_time / loads_time, 3),
+        "zoon_bytes": len(encoded.encode("utf-8")),
+        "json_bytes": len(as_json.encode("utf-8")),
+        "zoon_tokens": zoon_tokens,
+        "json_tokens": json_tokens,
+        "token_ratio": round(zoon_tokens / json_tokens, 4),
+    }
+    if memory:
+        result["encode_peak_bytes"] = _peak_memory(lambda: zoon.encode(data))
+        result["decode_peak_bytes"] = _peak_memory(lambda: zoon.decode(encoded))
+    return result
+
+
+# Metric name -> True when higher is better. Raw rows/sec are reported but
+# not compared: they move with the machine and its load.
+_COMPARED = {
+    "encode_vs_json": False,
+    "decode_vs_json": False,
+    "encode_peak_bytes": False,
+    "decode_peak_bytes": False,
+    "token_ratio": False,
+}
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    # Lines describing every metric that got worse by more than threshold
+    previous = {(entry["dataset"], entry["rows"]): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry["dataset"], entry["rows"]))
+        if before is None:
+            continue
+        for metric, higher_is_better in _COMPARED.items():
+            if metric not in entry or metric not in before or not before[metric]:
+                continue
+            change = entry[metric] / before[metric] - 1
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"{entry['dataset']}/{entry['rows']} {metric}: "
+                                   f"{before[metric]:,} -> {entry[metric]:,} ({change:+.1%})")
+    return regressions
+
+
+def _print_table(results: list[dict]):
+    print(f"{'dataset':<9} {'rows':>9} {'enc rows/s':>12} {'dec rows/s':>12} {'enc/json':>9} {'dec/json':>9} "
+          f"{'tokens':>7} {'enc peak':>10}")
+    for entry in results:
+        peak = entry.get("encode_peak_bytes")
+        peak = f"{peak / 2**20:.1f}MiB" if peak is not None else "-"
+        print(f"{entry['dataset']:<9} {entry['rows']:>9,} {entry['encode_rows_per_sec']:>12,} "
+              f"{entry['decode_rows_per_sec']:>12,} {entry['encode_vs_json']:>8.1f}x {entry['decode_vs_json']:>8.1f}x "
+              f"{entry['token_ratio']:>7.1%} {peak:>10}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ZOON encode/decode benchmark suite")
+    parser.add_argument("--datasets", default=",".join(DATASETS),
+                        help="comma-separated subset of: " + ", ".join(DATASETS))
+    parser.add_argument("--rows", default="1000,10000",
+                        help="comma-separated table sizes, e.g. 1000,100000,10000000")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per measurement (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory runs")
+    parser.add_argument("--tokenizer", default=None, help="tiktoken encoding name; default is the built-in estimate")
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    args = parser.parse_args(argv)
+
+    names = args.datasets.split(",")
+    unknown = [name for name in names if name not in DATASETS]
+    if unknown:
+        parser.error(f"unknown datasets: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.rows.split(",")]
+
+    results = [measure(name, rows, args.repeat, not args.no_memory, args.tokenizer)
+               for name in names for rows in sizes]
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "zoon": zoon.__version__,
+        "tokenizer": args.tokenizer or "estimate",
+        "results": results,
+    }
+    _print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        return 0
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("tokenizer") != report["tokenizer"]:
+            print(f"baseline used tokenizer {baseline.get('tokenizer')!r}; token ratios not comparable")
+            baseline["results"] = [{k: v for k, v in entry.items() if k != "token_ratio"}
+                                   for entry in baseline["results"]]
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} vs {args.baseline}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nno regressions beyond {args.threshold:.0%} vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
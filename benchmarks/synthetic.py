@@ -0,0 +1,135 @@
+import random
+import string
+from collections.abc import Callable
+
+# Synthetic tables, one generator per shape the encoder treats differently.
+# Every generator is deterministic for a given (rows, seed).
+
+_WORDS = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "theta", "kappa", "lambda", "sigma"]
+_SERVICES = [f"svc-{i}" for i in range(12)]
+
+
+def wide(rows: int, seed: int = 1) -> list[dict]:
+    # 60 columns of mixed ints, floats, short strings and booleans
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        row = {"id": i + 1}
+        for c in range(20):
+            row[f"i{c}"] = rng.randint(0, 100_000)
+        for c in range(15):
+            row[f"f{c}"] = round(rng.random() * 1000, 3)
+        for c in range(15):
+            row[f"s{c}"] = rng.choice(_WORDS) + str(rng.randint(0, 99))
+        for c in range(9):
+            row[f"b{c}"] = rng.random() < 0.5
+        data.append(row)
+    return data
+
+
+def nested(rows: int, seed: int = 1) -> list[dict]:
+    # Deep objects sharing long prefixes, so aliases kick in
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        data.append({
+            "id": i + 1,
+            "request": {
+                "http": {"method": rng.choice(["GET", "POST", "PUT"]), "status": rng.choice([200, 201, 404, 500])},
+                "client": {"geo": {"country": rng.choice(["us", "de", "jp"]), "city": rng.choice(_WORDS)},
+                           "agent": {"name": rng.choice(["curl", "firefox", "chrome"]), "major": rng.randint(1, 130)}},
+            },
+            "response": {"timing": {"ttfb": rng.randint(1, 900), "total": rng.randint(900, 5000)},
+                         "cache": {"hit": rng.random() < 0.3}},
+            "cluster": {"region": "eu-west-1"},
+        })
+    return data
+
+
+def enum(rows: int, seed: int = 1) -> list[dict]:
+    # Low-cardinality columns: plain and indexed enums
+    rng = random.Random(seed)
+    levels = ["debug", "info", "notice", "warn", "error", "critical"]
+    return [
+        {
+            "id": i + 1,
+            "level": rng.choice(levels),
+            "service": rng.choice(_SERVICES),
+            "status": rng.choice(["ok", "fail"]),
+            "region": rng.choice(["us", "eu", "ap"]),
+            "tier": rng.choice(["free", "pro", "enterprise"]),
+        }
+        for i in range(rows)
+    ]
+
+
+def text(rows: int, seed: int = 1) -> list[dict]:
+    # Free text with spaces and quotes, written as quoted t cells
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        words = rng.choices(_WORDS, k=rng.randint(4, 16))
+        if rng.random() < 0.2:
+            words.insert(2, '"quoted"')
+        data.append({"id": i + 1, "author": rng.choice(_WORDS), "body": " ".join(words),
+                     "title": " ".join(rng.choices(_WORDS, k=3))})
+    return data
+
+
+def numeric(rows: int, seed: int = 1) -> list[dict]:
+    # Sensor-style numbers only
+    rng = random.Random(seed)
+    return [
+        {
+            "ts": 1_700_000_000 + i * 15,
+            "sensor": rng.randint(1, 500),
+            "temperature": round(rng.gauss(21, 4), 2),
+            "humidity": round(rng.uniform(20, 90), 1),
+            "pressure": round(rng.gauss(1013, 8), 1),
+            "count": rng.randint(0, 10_000),
+        }
+        for i in range(rows)
+    ]
+
+
+def sparse(rows: int, seed: int = 1) -> list[dict]:
+    # Many optional fields, mostly missing or None
+    rng = random.Random(seed)
+    optional = [f"opt_{c}" for c in string.ascii_lowercase[:16]]
+    data = []
+    for i in range(rows):
+        row = {"id": i + 1, "kind": rng.choice(["a", "b"])}
+        for key in optional:
+            roll = rng.random()
+            if roll < 0.1:
+                row[key] = rng.randint(0, 1000)
+            elif roll < 0.2:
+                row[key] = None
+        data.append(row)
+    return data
+
+
+def orders(rows: int, seed: int = 1) -> list[dict]:
+    # Orders with a list of line items each, written as a sub-table
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        items = [
+            {"line": n + 1, "sku": f"SKU-{rng.randint(1, 40):03d}", "qty": rng.randint(1, 5),
+             "price": round(rng.uniform(1, 200), 2), "currency": "EUR"}
+            for n in range(rng.randint(1, 6))
+        ]
+        data.append({"id": i + 1, "customer": rng.choice(_WORDS), "status": rng.choice(["open", "paid", "shipped"]),
+                     "items": items})
+    return data
+
+
+DATASETS: dict[str, Callable[[int, int], list[dict]]] = {
+    "wide": wide,
+    "nested": nested,
+    "enum": enum,
+    "text": text,
+    "numeric": numeric,
+    "sparse": sparse,
+    "orders": orders,
+}
@@ -1,5 +1,14 @@
-from .encoder import encode
-from .decoder import decode
+from .encoder import encode, encode_iter, encode_to, encode_into
+from .decoder import decode, decode_iter, header_cache_info, header_cache_clear, set_header_cache_size
+from .schema import Schema
+from .columnar import encode_columns, decode_columns, Categorical
+from .table import ZoonTable, open
+from .appender import ZoonAppender
+from .tokens import encode_within, count_tokens, estimate_tokens
+from .profiling import profile, Profile
+from .cache import EncodeCache
+from .batch import encode_many, decode_many
+from .aio import aencode_iter, aencode_to, adecode_iter
 
 __version__ = "1.0.0"
-__all__ = ["encode", "decode"]
+__all__ = ["encode", "encode_iter", "encode_to", "encode_into", "decode", "decode_iter", "header_cache_info", "header_cache_clear", "set_header_cache_size", "Schema", "encode_columns", "decode_columns", "Categorical", "ZoonTable", "ZoonAppender", "encode_within", "count_tokens", "estimate_tokens", "profile", "Profile", "EncodeCache", "encode_many", "decode_many", "aencode_iter", "aencode_to", "adecode_iter"]
@@ -0,0 +1,182 @@
+import types
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from itertools import islice
+from typing import Any
+from .encoder import (
+    STREAM_WINDOW, STREAM_CHUNK, _flatten_streamed, _infer_schema, _consuming_keys, _compile_row_check,
+    _compile_row_encoder, _encode_header
+)
+from .decoder import (
+    decode, _parse_alias_line, _parse_header, _compile_row_decoder, _compile_selection, _tokenize_row,
+    _tokenize_prefix
+)
+
+
+@types.coroutine
+def _pause():
+    # Hands control back to the event loop for one iteration, as
+    # asyncio.sleep(0) does, without importing asyncio
+    yield
+
+
+class _RowSource:
+    # Rows pulled in batches from a plain or an async iterable
+
+    def __init__(self, data: Iterable[dict] | AsyncIterable[dict]):
+        if hasattr(data, "__aiter__"):
+            self._rows = None
+            self._async_rows = data.__aiter__()
+        else:
+            self._rows = iter(data)
+            self._async_rows = None
+
+    async def take(self, count: int) -> list:
+        if self._rows is not None:
+            return list(islice(self._rows, count))
+        batch = []
+        while len(batch) < count:
+            try:
+                batch.append(await self._async_rows.__anext__())
+            except StopAsyncIteration:
+                break
+        return batch
+
+
+async def aencode_iter(data: Iterable[dict] | AsyncIterable[dict], window: int = STREAM_WINDOW,
+                       chunk_size: int = STREAM_CHUNK) -> AsyncIterator[str]:
+    # encode_iter for event loops: the same chunks, from a plain or async
+    # iterable of dicts, with the loop given a turn after every chunk so
+    # that a large table never blocks it for more than chunk_size rows
+    if window < 1 or chunk_size < 1:
+        raise ValueError("window and chunk_size must be positive")
+    source = _RowSource(data)
+    head = [_flatten_streamed(row) for row in await source.take(window)]
+    if not head:
+        yield "[]"
+        return
+
+    constant_fields, active_keys, column_info, aliases = _infer_schema(head)
+    consuming = _consuming_keys(active_keys, column_info)
+    row_fits = _compile_row_check(constant_fields, column_info)
+    index = len(head)
+
+    async def tail_batches() -> AsyncIterator[list[dict]]:
+        nonlocal index
+        while True:
+            await _pause()
+            batch = await source.take(chunk_size)
+            if not batch:
+                return
+            flat = []
+            for row in batch:
+                flat.append(_flatten_streamed(row, index, row_fits, len(head)))
+                index += 1
+            yield flat
+
+    if not consuming:
+        # Rows carry no data, only the count ends up in the header
+        async for _ in tail_batches():
+            pass
+        yield _encode_header(constant_fields, active_keys, column_info, aliases, index) + "\n"
+        return
+
+    yield _encode_header(constant_fields, active_keys, column_info, aliases, len(head)) + "\n"
+    encode_row = _compile_row_encoder(consuming, column_info)
+    separator = ""
+    for start in range(0, len(head), chunk_size):
+        await _pause()
+        yield separator + "\n".join(map(encode_row, head[start:start + chunk_size]))
+        separator = "\n"
+    async for batch in tail_batches():
+        yield separator + "\n".join(map(encode_row, batch))
+
+
+async def aencode_to(data: Iterable[dict] | AsyncIterable[dict], writer: Any, window: int = STREAM_WINDOW,
+                     chunk_size: int = STREAM_CHUNK) -> None:
+    # writer is an asyncio.StreamWriter, or anything with write(bytes) and
+    # an awaitable drain(); draining after each chunk applies backpressure
+    async for chunk in aencode_iter(data, window, chunk_size):
+        writer.write(chunk.encode("utf-8"))
+        await writer.drain()
+
+
+async def adecode_iter(source: AsyncIterable[str] | AsyncIterable[bytes], columns: Iterable[str] | None = None,
+                       where: dict[str, Any] | None = None, chunk_size: int = STREAM_CHUNK) -> AsyncIterator[Any]:
+    # decode_iter for event loops: rows are yielded as their lines arrive
+    # from an asyncio.StreamReader or any async iterable of lines. A reader
+    # whose buffer already holds many lines does not suspend between them,
+    # so the loop is also given a turn every chunk_size rows.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    lines = _text_lines(source)
+    aliases = {}
+    consumed = []
+    async for line in lines:
+        stripped = line.strip()
+        consumed.append(line)
+        if not stripped:
+            continue
+        if stripped.startswith('%'):
+            _parse_alias_line(stripped, aliases)
+        elif stripped.startswith('#'):
+            header_columns, constants, explicit_rows = _parse_header(stripped, aliases)
+            decode_line = _compile_line_decoder(header_columns, constants, columns, where)
+            if explicit_rows > 0:
+                # Rows are generated from the header alone
+                for index in range(explicit_rows):
+                    row = decode_line("", index)
+                    if row is not None:
+                        yield row
+                    if (index + 1) % chunk_size == 0:
+                        await _pause()
+                return
+            index = 0
+            async for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                row = decode_line(line, index)
+                index += 1
+                if row is not None:
+                    yield row
+                if index % chunk_size == 0:
+                    await _pause()
+            return
+        else:
+            break
+
+    # Not a table: the document is a single inline value or list
+    async for line in lines:
+        consumed.append(line)
+    result = decode("\n".join(line.rstrip("\r\n") for line in consumed))
+    if isinstance(result, list):
+        for item in result:
+            yield item
+    elif result is not None:
+        yield result
+
+
+async def _text_lines(source: AsyncIterable[str] | AsyncIterable[bytes]) -> AsyncIterator[str]:
+    async for line in source:
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode("utf-8")
+        yield line
+
+
+def _compile_line_decoder(columns: list[dict], constants: dict, select: Iterable[str] | None,
+                          where: dict[str, Any] | None) -> Callable[[str, int], dict | None]:
+    # One stripped row line to its row, or None when it fails `where`
+    if select is None and not where:
+        decode_row = _compile_row_decoder(columns, constants)
+        return lambda line, index: decode_row(_tokenize_row(line) if line else [], index)
+    decode_row, width = _compile_selection(columns, constants, select, where)
+
+    def decode_line(line: str, index: int) -> dict | None:
+        if not line:
+            tokens = []
+        elif width is None:
+            tokens = _tokenize_row(line)
+        else:
+            tokens = _tokenize_prefix(line, width) if width else []
+        return decode_row(tokens, index)
+    return decode_line
@@ -0,0 +1,125 @@
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable
+from .encoder import encode, _flatten_object, _encode_header
+from .decoder import decode, _parse_header
+from .schema import Schema
+from .table import _read_preamble, _row_starts
+from .types import TYPE_AUTO_INCREMENT
+
+
+class ZoonAppender:
+    # Grows a tabular ZOON file. Rows that fit the existing header are
+    # written as new lines at the end of the file; rows that need a
+    # different header (new column, new indexed enum member, broken constant
+    # or i+ sequence, wider type) rewrite the file with a re-inferred one.
+    #
+    # The existing row count is only needed to continue i+ columns; it is
+    # counted from the file the first time it is needed.
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        self._load()
+
+    def _load(self):
+        self.schema = None
+        self._auto = False
+        self._rows = 0
+        if not os.path.exists(self.path):
+            return
+        with io.open(self.path, "rb") as fp:
+            if not os.fstat(fp.fileno()).st_size:
+                return
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                aliases, header_line, body_start = _read_preamble(data)
+                if header_line is None:
+                    # encode([]) writes an empty list; anything else is not a table
+                    if data[:].strip() == b"[]":
+                        return
+                    raise ValueError(f"{self.path!r} is not a tabular ZOON document")
+                self.schema = Schema.from_header(data[:body_start].decode("utf-8"))
+                _, _, explicit_rows = _parse_header(header_line, aliases)
+
+        self._body_start = body_start
+        self._auto = any(info["type"] == TYPE_AUTO_INCREMENT for info in self.schema.column_info.values())
+        self._rows = explicit_rows if not self.schema._consuming else None
+
+    def _row_count(self) -> int:
+        if self._rows is None:
+            with io.open(self.path, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self._rows = sum(1 for _ in _row_starts(data, self._body_start))
+        return self._rows
+
+    def append(self, rows: Iterable[dict]) -> bool:
+        # True when the rows were appended in place, False when the file had
+        # to be rewritten under a new header
+        rows = list(rows)
+        if not all(isinstance(row, dict) for row in rows):
+            raise TypeError("ZoonAppender.append expects an iterable of dicts")
+        if not rows:
+            return True
+
+        schema = self.schema
+        if schema is not None:
+            flattened_data = [_flatten_object(row) for row in rows]
+            start = self._row_count() if self._auto or not schema._consuming else 0
+            row_fits = schema._row_fits
+            if all(row_fits(row, start + i) for i, row in enumerate(flattened_data)):
+                if schema._consuming:
+                    self._write_lines(map(schema._encode_row, flattened_data))
+                else:
+                    # +N form: the whole file is the header, so write it anew
+                    header = _encode_header(schema.constants, schema.keys, schema.column_info,
+                                            schema.aliases, start + len(rows))
+                    self._replace(header + "\n")
+                if self._rows is not None:
+                    self._rows += len(rows)
+                return True
+
+        self._rewrite(rows)
+        return False
+
+    def _write_lines(self, lines: Iterable[str]):
+        with io.open(self.path, "rb+") as fp:
+            fp.seek(0, os.SEEK_END)
+            if fp.tell():
+                fp.seek(-1, os.SEEK_END)
+                newline = fp.read(1) != b"\n"
+                fp.seek(0, os.SEEK_END)
+            else:
+                newline = False
+            text = "\n".join(lines)
+            fp.write((("\n" if newline else "") + text).encode("utf-8"))
+
+    def _rewrite(self, rows: list[dict]):
+        data = []
+        if self.schema is not None:
+            with io.open(self.path, encoding="utf-8") as fp:
+                data = decode(fp.read())
+        data.extend(rows)
+        self._replace(encode(data))
+        self._load()
+        self._rows = len(data)
+
+    def _replace(self, text: str):
+        # Written next to the target and swapped in, so readers never see a
+        # half-written file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with io.open(fd, "w", encoding="utf-8", newline="") as fp:
+                fp.write(text)
+            if os.path.exists(self.path):
+                shutil.copymode(self.path, temp_path)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def __repr__(self) -> str:
+        header = self.schema.header if self.schema is not None else None
+        return f"<ZoonAppender {self.path!r} {header!r}>"
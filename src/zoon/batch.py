@@ -0,0 +1,100 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
+from typing import Any
+from .encoder import (
+    encode, _flatten_object, _full_stats, _decide_columns, _detect_aliases, _encode_header,
+    _consuming_keys, _compile_row_encoder
+)
+from .decoder import decode
+from .profiling import _current_profile
+
+# Documents per task handed to a worker; small documents are cheap, so
+# each task carries many to amortize the hand-off
+BATCH_CHUNK = 256
+
+
+def encode_many(datasets: Iterable[Any], workers: int | None = None, executor: Executor | None = None) -> list[str]:
+    # Same result as [encode(data) for data in datasets]. Each document still
+    # gets its own inferred header; what documents with the same columns
+    # share is the alias choice, the header text and the row encoder.
+    return _run_batches(_encode_batch, list(datasets), workers, executor)
+
+
+def decode_many(texts: Iterable[str], workers: int | None = None, executor: Executor | None = None) -> list[Any]:
+    # Same result as [decode(text) for text in texts]; documents with the
+    # same header share its compiled form through decode's header cache.
+    return _run_batches(_decode_batch, list(texts), workers, executor)
+
+
+def _run_batches(run: Callable[[list], list], items: list, workers: int | None, executor: Executor | None) -> list:
+    if workers is None and executor is None:
+        return run(items)
+    from .parallel import _make_executor, _resolve_workers
+    workers = _resolve_workers(workers)
+    size = max(1, min(BATCH_CHUNK, -(-len(items) // (workers * 4))))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    if executor is not None:
+        return [result for chunk in executor.map(run, chunks) for result in chunk]
+    if workers == 1 or len(chunks) < 2:
+        return run(items)
+    with _make_executor(workers) as pool:
+        return [result for chunk in pool.map(run, chunks) for result in chunk]
+
+
+def _encode_batch(datasets: list) -> list[str]:
+    aliases_by_keys = {}
+    compiled = {}
+    headers = {}
+    results = []
+    profiled = _current_profile() is not None
+    for data in datasets:
+        if profiled or not (isinstance(data, list) and data and all(isinstance(row, dict) for row in data)):
+            results.append(encode(data))
+            continue
+
+        flattened_data = [_flatten_object(row) for row in data]
+        constant_fields, column_info = _decide_columns(_full_stats(flattened_data), len(flattened_data))
+        active_keys = tuple(column_info)
+        aliases = aliases_by_keys.get(active_keys)
+        if aliases is None:
+            aliases = aliases_by_keys[active_keys] = _detect_aliases(list(active_keys))
+
+        signature = (active_keys, tuple(_info_signature(info) for info in column_info.values()))
+        entry = compiled.get(signature)
+        if entry is None:
+            consuming = _consuming_keys(list(active_keys), column_info)
+            encode_row = _compile_row_encoder(consuming, column_info) if consuming else None
+            entry = compiled[signature] = (consuming, encode_row)
+        consuming, encode_row = entry
+
+        # +N headers carry the row count; others do not depend on it
+        header_key = (signature, _constants_signature(constant_fields), 0 if consuming else len(data))
+        header = headers.get(header_key)
+        if header is None:
+            header = headers[header_key] = _encode_header(constant_fields, list(active_keys), column_info,
+                                                          aliases, len(data))
+
+        if consuming:
+            results.append(header + "\n" + "\n".join(map(encode_row, flattened_data)))
+        else:
+            results.append(header + "\n")
+    return results
+
+
+def _info_signature(info: dict) -> tuple:
+    table = info.get("table")
+    if table is not None:
+        child_constants, child_info = table
+        table = (_constants_signature(child_constants),
+                 tuple((key, _info_signature(child)) for key, child in child_info.items()))
+    return info["type"], tuple(info["enum"]) if info["enum"] else None, bool(info.get("indexed")), table
+
+
+def _constants_signature(constant_fields: dict) -> tuple:
+    # repr tells 1, 1.0, True and -0.0 apart, which are all written
+    # differently, and copes with unhashable list constants
+    return tuple((key, repr(value)) for key, value in constant_fields.items())
+
+
+def _decode_batch(texts: list[str]) -> list[Any]:
+    return [decode(text) for text in texts]
@@ -0,0 +1,111 @@
+import hashlib
+import io
+import marshal
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
+from .encoder import encode
+
+# Options that change how encoding runs but never what it returns
+_NEUTRAL_OPTIONS = ("workers", "executor")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+
+
+class EncodeCache:
+    # Remembers encode() results for repeated inputs. Entries are keyed by a
+    # hash of the pickled data, or by a caller-supplied key (e.g. a catalog
+    # version) which skips hashing altogether; least recently used entries
+    # are dropped past max_entries or max_bytes.
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 2**20):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, str] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def encode(self, data: Any, key: Any = None, **options) -> str:
+        options = tuple(sorted((name, value) for name, value in options.items() if name not in _NEUTRAL_OPTIONS))
+        if key is None:
+            key = _fingerprint(data)
+            if key is None:
+                # Unpicklable input: nothing to key on
+                with self._lock:
+                    self.misses += 1
+                return encode(data, **dict(options))
+        entry_key = (key, options)
+
+        with self._lock:
+            text = self._entries.get(entry_key)
+            if text is not None:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return text
+            self.misses += 1
+
+        text = encode(data, **dict(options))
+        size = sys.getsizeof(text)
+        if size > self.max_bytes:
+            return text
+        with self._lock:
+            previous = self._entries.pop(entry_key, None)
+            if previous is not None:
+                self._bytes -= sys.getsizeof(previous)
+            self._entries[entry_key] = text
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sys.getsizeof(evicted)
+        return text
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries), self._bytes,
+                             self.max_entries, self.max_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<EncodeCache {self.info()}>"
+
+
+def _fingerprint(data: Any) -> bytes | None:
+    # Serialized bytes tell 1, 1.0 and True apart and keep every element
+    # (repr would elide large arrays). marshal covers plain JSON-like data
+    # several times faster than pickle, which handles everything else.
+    # Both run without back-references: those depend on which objects
+    # happen to be shared (or interned), so equal data built differently
+    # would get different keys.
+    try:
+        payload = marshal.dumps(data, 2)
+    except ValueError:
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.fast = True
+        try:
+            pickler.dump(data)
+        except Exception:
+            return None
+        payload = buffer.getvalue()
+    return hashlib.blake2b(payload, digest_size=16).digest()
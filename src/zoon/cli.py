@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from itertools import chain, islice
+from typing import IO, Any
+from .encoder import encode, encode_iter, STREAM_WINDOW
+from .decoder import decode, decode_iter
+from .tokens import _resolve_tokenizer
+
+# Rows serialized per write() when streaming JSON out
+WRITE_BATCH = 1000
+
+_NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be positive")
+    if getattr(args, "sample", None) is not None and args.sample < 1:
+        parser.error("--sample must be positive")
+
+    try:
+        stats = _Stats(args.tokenizer) if args.stats else None
+    except ImportError:
+        print("zoon: --tokenizer needs tiktoken (pip install tiktoken)", file=sys.stderr)
+        return 1
+    except (KeyError, ValueError):
+        print(f"zoon: unknown tokenizer {args.tokenizer!r}", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    try:
+        with _open(args.input, "r", sys.stdin) as source, _open(args.output, "w", sys.stdout) as out:
+            if args.command == "encode":
+                _encode(args, source, out, stats)
+            else:
+                _decode(args, source, out, stats)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); keep Python from failing
+        # again when it flushes stdout on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (ValueError, TypeError, OSError) as exc:
+        print(f"zoon: {exc}", file=sys.stderr)
+        return 1
+    if stats is not None:
+        print(stats.report(time.perf_counter() - start), file=sys.stderr)
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="zoon", description="Convert between JSON/NDJSON and ZOON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    encode_parser = commands.add_parser("encode", help="JSON or NDJSON to ZOON")
+    encode_parser.add_argument("--ndjson", action="store_true",
+                               help="input is one JSON object per line (implied by .ndjson/.jsonl); "
+                                    "it is streamed unless --jobs is given")
+    encode_parser.add_argument("--sample", type=int, default=None,
+                               help="infer the header from this many rows (the window for NDJSON input)")
+
+    decode_parser = commands.add_parser("decode", help="ZOON to JSON or NDJSON")
+    decode_parser.add_argument("--ndjson", action="store_true", help="write one JSON object per line")
+    decode_parser.add_argument("--columns", default=None, help="comma-separated fields to keep")
+
+    for command in (encode_parser, decode_parser):
+        command.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+        command.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+        command.add_argument("--jobs", type=int, default=None,
+                             help="convert with N workers; the whole input is read first")
+        command.add_argument("--stats", action="store_true",
+                             help="print rows/sec and size and token savings versus compact JSON to stderr")
+        command.add_argument("--tokenizer", default=None,
+                             help="tiktoken encoding for --stats; default is the built-in estimate")
+    return parser
+
+
+def _open(path: str, mode: str, default: IO[str]):
+    if path == "-":
+        return nullcontext(default)
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode(args: argparse.Namespace, source: IO[str], out: IO[str], stats: "_Stats | None"):
+    ndjson = args.ndjson or args.input.endswith(_NDJSON_SUFFIXES)
+    if ndjson and args.jobs is None:
+        rows = _ndjson_rows(source)
+        if stats is not None:
+            rows = stats.watch_rows(rows)
+        chunks = encode_iter(rows, window=args.sample or STREAM_WINDOW)
+    else:
+        data = list(_ndjson_rows(source)) if ndjson else json.load(source)
+        if stats is not None:
+            stats.add_document(data)
+        chunks = [encode(data, workers=args.jobs, sample=args.sample)]
+
+    last = ""
+    for chunk in chunks:
+        out.write(chunk)
+        if stats is not None:
+            stats.add_zoon(chunk)
+        last = chunk
+    if not last.endswith("\n"):
+        out.write("\n")
+
+
+def _ndjson_rows(lines: Iterable[str]) -> Iterator[Any]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _decode(args: argparse.Namespace, source: IO[str], out: IO[str], stats: "_Stats | None"):
+    columns = args.columns.split(",") if args.columns else None
+    try:
+        _decode_document(args, columns, source, out, stats)
+    except KeyError as exc:
+        if columns is None:
+            raise
+        raise ValueError(f"unknown column {exc}") from None
+
+
+def _decode_document(args: argparse.Namespace, columns: list[str] | None, source: IO[str], out: IO[str],
+                     stats: "_Stats | None"):
+    lines = iter(source)
+    if stats is not None:
+        lines = stats.watch_lines(lines)
+
+    if args.jobs is not None:
+        result = decode("".join(lines), workers=args.jobs, columns=columns)
+    else:
+        # Tables stream row by row; inline values are decoded whole
+        leading = []
+        for line in lines:
+            leading.append(line)
+            if line.strip():
+                break
+        lines = chain(leading, lines)
+        if leading and leading[-1].lstrip().startswith(("%", "#")):
+            _write_rows(decode_iter(lines, columns=columns), out, args.ndjson, stats)
+            return
+        result = decode("".join(lines))
+
+    if isinstance(result, list):
+        _write_rows(result, out, args.ndjson, stats)
+        return
+    if stats is not None:
+        stats.add_document(result)
+    out.write(json.dumps(result) + "\n")
+
+
+def _write_rows(rows: Iterable[Any], out: IO[str], ndjson: bool, stats: "_Stats | None"):
+    # A JSON array is written as json.dumps would write it, one batch of
+    # rows at a time. Nothing is written before the first batch is decoded,
+    # so a bad --columns name leaves the output empty.
+    rows = iter(rows)
+    written = False
+    while True:
+        batch = list(islice(rows, WRITE_BATCH))
+        if not batch:
+            break
+        if stats is not None:
+            for row in batch:
+                stats.add_row(row)
+        if ndjson:
+            out.write("".join(json.dumps(row) + "\n" for row in batch))
+        else:
+            out.write((", " if written else "[") + ", ".join(map(json.dumps, batch)))
+        written = True
+    if not ndjson:
+        out.write("]\n" if written else "[]\n")
+
+
+class _Stats:
+    # Counts rows, bytes and tokens of both sides as the data goes by. JSON
+    # is measured in compact form, as in the benchmarks; time spent here is
+    # left out of rows/sec.
+
+    def __init__(self, tokenizer: str | None):
+        self.tokenizer = tokenizer
+        self.count_tokens = _resolve_tokenizer(tokenizer)
+        self.rows = 0
+        self.zoon_bytes = 0
+        self.zoon_tokens = 0
+        # The brackets of the array; each row adds itself and a comma
+        self.json_bytes = 1
+        self.json_tokens = 1
+        self.overhead = 0.0
+
+    def add_zoon(self, text: str):
+        start = time.perf_counter()
+        self.zoon_bytes += len(text.encode("utf-8"))
+        self.zoon_tokens += self.count_tokens(text)
+        self.overhead += time.perf_counter() - start
+
+    def add_row(self, row: Any):
+        start = time.perf_counter()
+        text = json.dumps(row, separators=(",", ":")) + ","
+        self.rows += 1
+        self.json_bytes += len(text.encode("utf-8"))
+        self.json_tokens += self.count_tokens(text)
+        self.overhead += time.perf_counter() - start
+
+    def add_document(self, data: Any):
+        if isinstance(data, list):
+            for row in data:
+                self.add_row(row)
+            return
+        start = time.perf_counter()
+        text = json.dumps(data, separators=(",", ":"))
+        self.rows += 1
+        self.json_bytes = len(text.encode("utf-8"))
+        self.json_tokens = self.count_tokens(text)
+        self.overhead += time.perf_counter() - start
+
+    def watch_rows(self, rows: Iterable[Any]) -> Iterator[Any]:
+        for row in rows:
+            self.add_row(row)
+            yield row
+
+    def watch_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            self.add_zoon(line)
+            yield line
+
+    def report(self, elapsed: float) -> str:
+        seconds = max(elapsed - self.overhead, 1e-9)
+        tokens = self.tokenizer or "estimate"
+        return "\n".join([
+            f"rows    {self.rows:,} in {seconds:.3f} s ({self.rows / seconds:,.0f} rows/s)",
+            f"bytes   zoon {self.zoon_bytes:,} vs json {self.json_bytes:,} ({_change(self.zoon_bytes, self.json_bytes)})",
+            f"tokens  zoon {self.zoon_tokens:,} vs json {self.json_tokens:,} "
+            f"({_change(self.zoon_tokens, self.json_tokens)}, {tokens})",
+        ])
+
+
+def _change(zoon_size: int, json_size: int) -> str:
+    return f"{zoon_size / json_size - 1:+.1%}" if json_size else "n/a"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+from array import array
+from collections.abc import Sequence
+from typing import Any
+from .encoder import (
+    encode, _ColumnStats, _choose_enum, _detect_aliases, _encode_header, _consuming_keys, _cell_encoder
+)
+from .decoder import (
+    _find_header, _parse_header, _tokenize_row, _cell_decoder, _compile_cell_reader, _decode_string
+)
+from .types import (
+    TYPE_STRING, TYPE_TEXT, TYPE_INTEGER, TYPE_NUMBER, TYPE_BOOLEAN, TYPE_AUTO_INCREMENT, TYPE_TABLE,
+    MARKER_NULL,
+    BOOL_TRUE, BOOL_FALSE
+)
+
+# NumPy and pandas are optional: inputs are recognised by their module so
+# neither is imported unless the caller already uses it.
+
+
+def _module_of(obj: Any) -> str:
+    return type(obj).__module__.split(".")[0]
+
+
+def encode_columns(columns: Any) -> str:
+    # Encode a table held column-wise (dict of sequences / NumPy arrays, or a
+    # pandas DataFrame) without building row dicts. Output matches
+    # encode() on the equivalent rows; NaN/NA in NumPy and pandas columns
+    # are written as nulls.
+    sources = _column_sources(columns)
+    lengths = {len(values) for values, _ in sources.values()}
+    if len(lengths) > 1:
+        raise ValueError("all columns must have the same length")
+    row_count = lengths.pop() if lengths else 0
+    if row_count == 0:
+        return encode([])
+
+    constant_fields = {}
+    column_info = {}
+    cells = {}
+    for key in sorted(sources):
+        values, mask = sources[key]
+        if _module_of(values) == "numpy" and values.dtype.kind in "iufbU":
+            result = _infer_array(values, mask, row_count)
+        else:
+            values = _as_list(values, mask)
+            if any(isinstance(v, dict) for v in values):
+                # Nested values need the row encoder's flattening
+                return encode(_rows(sources, row_count))
+            result = _infer_list(values, row_count)
+            if result[0] == "column" and result[1]["type"] == TYPE_TABLE:
+                # So do the child rows of a sub-table
+                return encode(_rows(sources, row_count))
+        if result[0] == "constant":
+            constant_fields[key] = result[1]
+        else:
+            column_info[key] = result[1]
+            cells[key] = (values, mask)
+
+    active_keys = list(column_info)
+    aliases = _detect_aliases(active_keys)
+    header_block = _encode_header(constant_fields, active_keys, column_info, aliases, row_count)
+    consuming = _consuming_keys(active_keys, column_info)
+    if not consuming:
+        return header_block + "\n"
+
+    encoded = [_encode_cells(*cells[key], column_info[key]) for key in consuming]
+    return header_block + "\n" + "\n".join(map(" ".join, zip(*encoded)))
+
+
+def _column_sources(columns: Any) -> dict[str, tuple[Any, Any]]:
+    if _module_of(columns) == "pandas":
+        return {str(name): _series_values(columns[name]) for name in columns.columns}
+    if not isinstance(columns, dict):
+        raise TypeError("encode_columns expects a dict of columns or a pandas DataFrame")
+    sources = {}
+    for name, column in columns.items():
+        module = _module_of(column)
+        if module == "pandas":
+            sources[str(name)] = _series_values(column)
+        elif module == "numpy":
+            mask = None
+            if column.dtype.kind == "f":
+                mask = column != column
+                if not mask.any():
+                    mask = None
+            sources[str(name)] = (column, mask)
+        else:
+            sources[str(name)] = (list(column), None)
+    return sources
+
+
+def _series_values(series: Any) -> tuple[Any, Any]:
+    mask = series.isna().to_numpy()
+    if not mask.any():
+        mask = None
+    kind = series.dtype.kind
+    if kind in "iu":
+        return series.to_numpy(dtype="int64" if kind == "i" else "uint64", na_value=0), mask
+    if kind == "b":
+        return series.to_numpy(dtype="bool", na_value=False), mask
+    if kind == "f":
+        return series.to_numpy(dtype="float64", na_value=float("nan")), mask
+    return series.to_numpy(dtype=object), mask
+
+
+def _as_list(values: Any, mask: Any) -> list:
+    if _module_of(values) == "numpy":
+        values = values.tolist()
+    if mask is not None:
+        values = [None if missing else v for v, missing in zip(values, mask.tolist())]
+    return values
+
+
+def _rows(sources: dict[str, tuple[Any, Any]], row_count: int) -> list[dict]:
+    keys = list(sources)
+    columns = [_as_list(values, mask) for values, mask in sources.values()]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def _infer_list(values: list, row_count: int) -> tuple[str, Any]:
+    stats = _ColumnStats()
+    stats.add(values, 0)
+    is_constant, result = stats.result(row_count)
+    return ("constant" if is_constant else "column"), result
+
+
+def _infer_array(values: Any, mask: Any, row_count: int) -> tuple[str, Any]:
+    kind = values.dtype.kind
+    if mask is not None:
+        present = values[~mask]
+        if present.size == 0:
+            return _infer_list([None] * row_count, row_count)
+    elif row_count > 1 and (values == values[0]).all():
+        return "constant", values[0].item()
+
+    if kind == "b":
+        return "column", {"type": TYPE_BOOLEAN, "enum": None}
+    if kind == "f":
+        return "column", {"type": TYPE_NUMBER, "enum": None}
+    if kind in "iu":
+        if mask is None and row_count >= 2 and values[0] == 1 and ((values[1:] - values[:-1]) == 1).all():
+            return "column", {"type": TYPE_AUTO_INCREMENT, "enum": None}
+        return "column", {"type": TYPE_INTEGER, "enum": None}
+
+    # Fixed-width unicode: sorted distinct values come straight from np.unique
+    import numpy as np
+    present = values if mask is None else values[~mask]
+    unique = np.unique(present)
+    if len(unique) <= 10:
+        enum_values, indexed = _choose_enum(unique.tolist(), present.size, row_count)
+        if enum_values and present.size >= 2:
+            return "column", {"type": TYPE_STRING, "enum": enum_values, "indexed": indexed}
+    if np.char.str_len(present).mean() > 30:
+        return "column", {"type": TYPE_TEXT, "enum": None}
+    return "column", {"type": TYPE_STRING, "enum": None}
+
+
+def _encode_cells(values: Any, mask: Any, info: dict) -> list[str]:
+    if _module_of(values) == "numpy" and values.dtype.kind in "iufb":
+        items = values.tolist()
+        if values.dtype.kind == "b":
+            cells = [BOOL_TRUE if v else BOOL_FALSE for v in items]
+        else:
+            cells = list(map(str, items))
+        if mask is not None:
+            cells = [MARKER_NULL if missing else cell for cell, missing in zip(cells, mask.tolist())]
+        return cells
+    return list(map(_cell_encoder(info), _as_list(values, mask)))
+
+
+_BACKENDS = ("list", "array", "numpy")
+_BLOCK_ROWS = 4096
+_TYPECODES = {TYPE_INTEGER: "q", TYPE_AUTO_INCREMENT: "q", TYPE_NUMBER: "d", TYPE_BOOLEAN: "b"}
+
+
+class Categorical(Sequence):
+    # Indexed enum column: integer codes into `categories`, -1 for null
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: Any, categories: list):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Categorical(self.codes[index], self.categories)
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Categorical):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Categorical({[int(code) for code in self.codes]!r}, {self.categories!r})"
+
+
+def decode_columns(zoon_string: str, backend: str = "list") -> dict[str, Any]:
+    # Decode a table straight into one container per column, never building
+    # row dicts. "array" and "numpy" give typed containers for i, n, b and
+    # i+ columns without nulls and Categorical codes for indexed enums;
+    # anything else stays a list (object array for numpy).
+    if backend not in _BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(_BACKENDS)}")
+    lines = zoon_string.strip().split('\n')
+    aliases, header_index = _find_header(lines)
+    if header_index == -1:
+        raise ValueError("decode_columns expects a tabular ZOON document")
+    columns, constants, explicit_rows = _parse_header(lines[header_index], aliases)
+
+    builders = [_ColumnBuilder(col, backend) for col in columns if col["type"] != TYPE_AUTO_INCREMENT]
+    width = len(builders)
+    padding = [MARKER_NULL] * width
+    row_count = explicit_rows
+    # Sub-table cells get their decoded child rows instead of the count
+    read_cells = None
+    if any(col["type"] == TYPE_TABLE for col in columns):
+        read_cells = _compile_cell_reader(columns)
+
+    if explicit_rows:
+        for builder in builders:
+            builder.add(padding[:1] * explicit_rows)
+    else:
+        block = []
+        for line in lines[header_index + 1:]:
+            line = line.strip()
+            if not line:
+                continue
+            tokens = _tokenize_row(line)
+            if read_cells is not None:
+                tokens = read_cells(tokens, 0)[0]
+            elif len(tokens) < width:
+                tokens += padding[len(tokens):]
+            block.append(tokens)
+            if len(block) == _BLOCK_ROWS:
+                _add_block(builders, block)
+                row_count += len(block)
+                block = []
+        if block:
+            _add_block(builders, block)
+            row_count += len(block)
+
+    result = {}
+    consumed = iter(builders)
+    for col in columns:
+        if col["type"] == TYPE_AUTO_INCREMENT:
+            result[col["key"]] = _finish(array("q", range(1, row_count + 1)), TYPE_INTEGER, backend)
+        else:
+            result[col["key"]] = next(consumed).finish()
+    for key, value in constants.items():
+        result[key] = _finish([value] * row_count, _type_of(value), backend)
+    return result
+
+
+def _add_block(builders: list, block: list[list[str]]):
+    for builder, tokens in zip(builders, zip(*block)):
+        builder.add(tokens)
+
+
+class _ColumnBuilder:
+    # Accumulates one column block by block: typed storage while every token
+    # parses cleanly, plain decoded values otherwise.
+
+    __slots__ = ("kind", "backend", "convert", "store", "typed", "categories", "by_token")
+
+    def __init__(self, col: dict, backend: str):
+        self.kind = col["type"]
+        self.backend = backend
+        self.convert = _cell_decoder(col)
+        self.categories = None
+        if col["enum"] and col.get("indexed") and backend != "list":
+            self.categories = [_decode_string(v) for v in col["enum"]]
+            self.by_token = {str(i): i for i in range(len(self.categories))}
+            self.by_token[MARKER_NULL] = -1
+            self.store = array("i")
+        elif col["enum"] or backend == "list" or self.kind not in _TYPECODES:
+            self.store = []
+        else:
+            self.store = array(_TYPECODES[self.kind])
+        self.typed = isinstance(self.store, array)
+
+    def add(self, tokens: Sequence[str]):
+        if self.categories is not None:
+            codes = list(map(self.by_token.get, tokens))
+            if None in codes:
+                codes = [self._category(token) if code is None else code for code, token in zip(codes, tokens)]
+            self.store.extend(codes)
+            return
+        if self.typed:
+            start = len(self.store)
+            try:
+                if self.kind == TYPE_BOOLEAN:
+                    if MARKER_NULL in tokens:
+                        raise ValueError
+                    self.store.extend([token == BOOL_TRUE for token in tokens])
+                elif self.kind == TYPE_NUMBER:
+                    self.store.extend(map(float, tokens))
+                else:
+                    self.store.extend(map(int, tokens))
+                return
+            except (ValueError, OverflowError):
+                # Nulls or stray values: keep what was parsed, go untyped
+                del self.store[start:]
+                parsed = self.store.tolist()
+                self.store = [bool(v) for v in parsed] if self.kind == TYPE_BOOLEAN else parsed
+                self.typed = False
+        self.store.extend(map(self.convert, tokens))
+
+    def _category(self, token: str) -> int:
+        value = self.convert(token)
+        if value not in self.categories:
+            self.categories.append(value)
+        return self.categories.index(value)
+
+    def finish(self) -> Any:
+        if self.categories is not None:
+            codes = self.store
+            if self.backend == "numpy":
+                import numpy as np
+                codes = np.frombuffer(codes, dtype=np.int32).copy()
+            return Categorical(codes, self.categories)
+        return _finish(self.store, self.kind, self.backend)
+
+
+def _type_of(value: Any) -> str:
+    if isinstance(value, bool):
+        return TYPE_BOOLEAN
+    if isinstance(value, int):
+        return TYPE_INTEGER
+    if isinstance(value, float):
+        return TYPE_NUMBER
+    return TYPE_STRING
+
+
+def _finish(values: Any, kind: str, backend: str) -> Any:
+    typecode = _TYPECODES.get(kind)
+    if backend == "list":
+        return values.tolist() if isinstance(values, array) else values
+    if typecode and not isinstance(values, array) and None not in values:
+        try:
+            values = array(typecode, values)
+        except (TypeError, OverflowError):
+            pass
+    if backend == "array":
+        return values
+
+    import numpy as np
+    if isinstance(values, array):
+        dtype = {"q": np.int64, "d": np.float64, "b": np.int8}[values.typecode]
+        result = np.frombuffer(values, dtype=dtype).copy()
+        return result.astype(bool) if values.typecode == "b" else result
+    if kind == TYPE_NUMBER and all(v is None or type(v) in (int, float) for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.fromiter(values, dtype=object, count=len(values))
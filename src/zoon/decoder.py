@@ -1,13 +1,33 @@
+import os
 import re
-from typing import Any
+from functools import lru_cache
+from itertools import islice
+from typing import IO, Any
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from .profiling import Profile, _current_profile
 from .types import (
-    TYPE_STRING, TYPE_INTEGER, TYPE_NUMBER, TYPE_BOOLEAN, TYPE_AUTO_INCREMENT,
+    TYPE_STRING, TYPE_INTEGER, TYPE_NUMBER, TYPE_BOOLEAN, TYPE_AUTO_INCREMENT, TYPE_TABLE,
     MARKER_NULL,
-    BOOL_TRUE, BOOL_FALSE
+    BOOL_TRUE, BOOL_FALSE, INLINE_BOOL_TRUE, INLINE_BOOL_FALSE
 )
 
+# Distinct alias+header texts whose compiled row decoders are kept
+HEADER_CACHE_SIZE = 256
+
+
+def decode(zoon_string: str | bytes | bytearray | memoryview, workers: int | None = None,
+           executor: Executor | None = None, columns: Iterable[str] | None = None,
+           where: dict[str, Any] | None = None) -> Any:
+    if not isinstance(zoon_string, str):
+        zoon_string = memoryview(zoon_string).cast("B")
+        if workers is None and executor is None and _current_profile() is None:
+            return _decode_buffer(zoon_string, columns, where)
+        zoon_string = str(zoon_string, "utf-8")
+    if workers is not None or executor is not None:
+        from .parallel import decode_parallel
+        return decode_parallel(zoon_string, workers, executor, columns, where)
 
-def decode(zoon_string: str) -> Any:
     zoon_string = zoon_string.strip()
     if not zoon_string:
         return None
@@ -16,73 +36,176 @@ def decode(zoon_string: str) -> Any:
     if not lines:
         return None
         
-    aliases = {}
-    header_index = -1
-    
-    for i, line in enumerate(lines):
+    preamble, header_index = _find_preamble(lines)
+
+    if header_index != -1:
+        if columns is None and not where and _current_profile() is None:
+            # Documents sharing a header reuse its compiled row decoder
+            _, _, explicit_rows, decode_row = _compiled_header(preamble)
+            return list(_iter_compiled(decode_row, explicit_rows, lines[header_index + 1:]))
+        # Reconstruct tabular part
+        return _decode_tabular(lines[header_index:], _parse_aliases(preamble[:-1]), columns, where)
+    elif zoon_string.startswith("["):
+        return _decode_simple_list(zoon_string)
+    else:
+        return _decode_inline(zoon_string)
+
+
+def _decode_buffer(buffer: memoryview, columns: Iterable[str] | None, where: dict[str, Any] | None) -> Any:
+    # UTF-8 input is decoded a block of lines at a time as the rows are
+    # built; only inline documents are decoded whole
+    lines = _buffer_lines(buffer)
+    preamble = []
+    for line in lines:
         line = line.strip()
         if not line:
             continue
-            
         if line.startswith('%'):
-            parts = line.split(' ')
-            for part in parts:
-                if '=' in part:
-                    alias_def, prefix = part.split('=', 1)
-                    if alias_def.startswith('%'):
-                        aliases[alias_def[1:]] = prefix
+            preamble.append(line)
         elif line.startswith('#'):
-            header_index = i
-            break
-        elif aliases:
-            # Aliases found but no header? Just assume inline/other
+            preamble.append(line)
+            header_columns, constants, explicit_rows, decode_row = _compiled_header(tuple(preamble))
+            if columns is None and not where:
+                return list(_iter_compiled(decode_row, explicit_rows, lines))
+            return list(_iter_rows(header_columns, constants, explicit_rows, lines, 0, columns, where))
+        else:
             break
+    return decode(str(buffer, "utf-8"), columns=columns, where=where)
+
+
+_LINE_BREAK = re.compile(rb"\n")
+# Bytes of input decoded to text at a time (rounded up to a line end)
+LINE_BLOCK = 1 << 16
+
+
+def _buffer_lines(buffer: memoryview) -> Iterator[str]:
+    start = 0
+    size = len(buffer)
+    while start < size:
+        match = _LINE_BREAK.search(buffer, start + LINE_BLOCK) if start + LINE_BLOCK < size else None
+        end = match.end() if match else size
+        yield from str(buffer[start:end], "utf-8").split("\n")
+        start = end
+
+
+def _find_header(lines: list[str]) -> tuple[dict, int]:
+    preamble, header_index = _find_preamble(lines)
+    return _parse_aliases(preamble if header_index == -1 else preamble[:-1]), header_index
+
+
+def _find_preamble(lines: list[str]) -> tuple[tuple[str, ...], int]:
+    # The stripped alias lines and '#' header line, and the header's index
+    preamble = []
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('%'):
+            preamble.append(line)
+        elif line.startswith('#'):
+            preamble.append(line)
+            return tuple(preamble), i
         else:
-            # Data found first
+            # Data (or aliases without a header): not a table
             break
-            
-    if header_index != -1:
-        # Reconstruct tabular part
-        return _decode_tabular(lines[header_index:], aliases)
-    elif zoon_string.startswith("["):
-        return _decode_simple_list(zoon_string)
+    return tuple(preamble), -1
+
+
+def _parse_aliases(alias_lines: Iterable[str]) -> dict:
+    aliases = {}
+    for line in alias_lines:
+        _parse_alias_line(line, aliases)
+    return aliases
+
+
+@lru_cache(maxsize=HEADER_CACHE_SIZE)
+def _compiled_header(preamble: tuple[str, ...]) -> tuple[list[dict], dict, int, Callable[[list[str], int], dict]]:
+    # Keyed by the raw alias and header lines. The returned objects are
+    # shared between calls and must not be modified.
+    columns, constants, explicit_rows = _parse_header(preamble[-1], _parse_aliases(preamble[:-1]))
+    return columns, constants, explicit_rows, _compile_row_decoder(columns, constants)
+
+
+def header_cache_info():
+    return _compiled_header.cache_info()
+
+
+def header_cache_clear():
+    _compiled_header.cache_clear()
+
+
+def set_header_cache_size(size: int | None):
+    # Replaces the cache (dropping its entries); None means unbounded, 0 disables it
+    global _compiled_header, HEADER_CACHE_SIZE
+    if size is not None and size < 0:
+        raise ValueError("header cache size must not be negative")
+    HEADER_CACHE_SIZE = size
+    _compiled_header = lru_cache(maxsize=size)(_compiled_header.__wrapped__)
+
+
+def decode_iter(source: str | os.PathLike | IO | Iterable[str] | Iterable[bytes],
+                columns: Iterable[str] | None = None, where: dict[str, Any] | None = None) -> Iterator[Any]:
+    # Rows are yielded one at a time; a str source is treated as a path
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as fp:
+            yield from _iter_document(fp, columns, where)
     else:
-        return _decode_inline(zoon_string)
+        yield from _iter_document(source, columns, where)
 
 
-def _unflatten_object(flat: dict) -> dict:
-    result = {}
-    for key, value in flat.items():
-        parts = key.split('.')
-        current = result
-        for i in range(len(parts) - 1):
-            part = parts[i]
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-            if not isinstance(current, dict):
-                 # Conflict: path segment is not a dict (shouldn't happen in valid ZOON)
-                 # Force over-write or error? overwrite for now
-                 current = {}
-                 result[parts[0]] = current # Reset? No this logic is fragile if conflict
-                 # Proper unflattening handles conflicts or assumes valid input
-        
-        current[parts[-1]] = value
-    return result
+def _text_lines(lines: Iterable[str] | Iterable[bytes]) -> Iterator[str]:
+    for line in lines:
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode("utf-8")
+        yield line
 
 
-def _deep_merge(target: dict, source: dict):
-    for key, value in source.items():
-        if isinstance(value, dict) and key in target and isinstance(target[key], dict):
-            _deep_merge(target[key], value)
+def _iter_document(source: Iterable[str] | Iterable[bytes], columns: Iterable[str] | None = None,
+                   where: dict[str, Any] | None = None) -> Iterator[Any]:
+    lines = _text_lines(source)
+    aliases = {}
+    consumed = []
+    for line in lines:
+        stripped = line.strip()
+        consumed.append(line)
+        if not stripped:
+            continue
+        if stripped.startswith('%'):
+            _parse_alias_line(stripped, aliases)
+        elif stripped.startswith('#'):
+            yield from _iter_tabular(stripped, lines, aliases, columns, where)
+            return
         else:
-            target[key] = value
+            break
+
+    # Not a table: the document is a single inline value or list
+    consumed.extend(lines)
+    result = decode("\n".join(line.rstrip("\r\n") for line in consumed))
+    if isinstance(result, list):
+        yield from result
+    elif result is not None:
+        yield result
+
+
+def _parse_alias_line(line: str, aliases: dict):
+    parts = line.split(' ')
+    for part in parts:
+        if '=' in part:
+            alias_def, prefix = part.split('=', 1)
+            if alias_def.startswith('%'):
+                aliases[alias_def[1:]] = prefix
 
 
 def _decode_string(value: str) -> str:
     return value.replace("_", " ")
 
 
+def _decode_cell_string(token: str) -> str:
+    # Inverse of encoder._encode_cell_value for strings
+    text = token.replace("_", " ")
+    return text.replace('\\"', '"') if '\\"' in text else text
+
+
 def _decode_value(value: str, expected_type: str = TYPE_STRING) -> Any:
     if value == MARKER_NULL:
         return None
@@ -113,38 +236,37 @@ def _decode_simple_list(zoon_string: str) -> list:
     return [_decode_value(item.strip()) for item in items]
 
 
+# Quoted cell (with backslash escapes), unterminated quote, [list] cell, bare token
+_TOKEN_PATTERN = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"|"(.*)|(\[[^\]]*\]?)|([^ ]+)')
+
+
 def _tokenize_row(line: str) -> list[str]:
+    if '"' not in line and '[' not in line:
+        tokens = line.split(' ')
+        if '' in tokens:
+            tokens = [token for token in tokens if token]
+        return tokens
+
     tokens = []
-    i = 0
-    while i < len(line):
-        while i < len(line) and line[i] == ' ':
-            i += 1
-        if i >= len(line):
-            break
-        if line[i] == '"':
-            end = i + 1
-            while end < len(line):
-                if line[end] == '\\' and end + 1 < len(line):
-                    end += 2
-                elif line[end] == '"':
-                    end += 1
-                    break
-                else:
-                    end += 1
-            tokens.append(line[i+1:end-1])
-            i = end
-        elif line[i] == '[':
-            end = i + 1
-            while end < len(line) and line[end] != ']':
-                end += 1
-            tokens.append(line[i:end+1])
-            i = end + 1
-        else:
-            end = i
-            while end < len(line) and line[end] != ' ':
-                end += 1
-            tokens.append(line[i:end])
-            i = end
+    for match in _TOKEN_PATTERN.finditer(line):
+        group = match.lastindex
+        # An unterminated quote runs to the end of the line, minus its last char
+        tokens.append(match[group] if group != 2 else match[group][:-1])
+    return tokens
+
+
+def _tokenize_prefix(line: str, count: int) -> list[str]:
+    # Only the first `count` tokens are needed; the rest of the line is left unsplit
+    if '"' not in line and '[' not in line:
+        tokens = line.split(' ', count)
+        if '' not in tokens[:count]:
+            return tokens
+        return [token for token in line.split(' ') if token][:count]
+
+    tokens = []
+    for match in islice(_TOKEN_PATTERN.finditer(line), count):
+        group = match.lastindex
+        tokens.append(match[group] if group != 2 else match[group][:-1])
     return tokens
 
 
@@ -184,7 +306,7 @@ def _parse_header(header_line: str, aliases: dict) -> tuple[list[dict], dict, in
     constants = {}
     explicit_rows = 0
     
-    parts = header_line.split()
+    parts = _header_parts(header_line)
     for part in parts:
         if part.startswith('+'):
             try:
@@ -196,7 +318,10 @@ def _parse_header(header_line: str, aliases: dict) -> tuple[list[dict], dict, in
         is_constant = False
         const_val = None
         
-        if part.startswith('@'):
+        if _opens_table(part) and part.endswith(']'):
+            key, const_val = part[:-1].split(':[', 1)
+            type_hint = TYPE_TABLE
+        elif part.startswith('@'):
             is_constant = True
             part_content = part[1:]
             if '=' in part_content:
@@ -238,9 +363,9 @@ def _parse_header(header_line: str, aliases: dict) -> tuple[list[dict], dict, in
             if type_hint == TYPE_STRING:
                 constants[key] = _decode_string(const_val)
             else:
-                # Infer type
-                if const_val in ('y', '1'): constants[key] = True
-                elif const_val in ('n', '0'): constants[key] = False
+                # Infer type; booleans are written y/n, so 1 and 0 are integers
+                if const_val == INLINE_BOOL_TRUE: constants[key] = True
+                elif const_val == INLINE_BOOL_FALSE: constants[key] = False
                 else:
                     try:
                         constants[key] = int(const_val)
@@ -252,6 +377,10 @@ def _parse_header(header_line: str, aliases: dict) -> tuple[list[dict], dict, in
         else:
             if type_hint == TYPE_AUTO_INCREMENT:
                 columns.append({"key": key, "type": TYPE_AUTO_INCREMENT, "enum": None, "indexed": False})
+            elif type_hint == TYPE_TABLE:
+                child_columns, child_constants, _ = _parse_header(const_val, {})
+                columns.append({"key": key, "type": TYPE_TABLE, "enum": None, "indexed": False,
+                                "table": (child_columns, child_constants)})
             elif type_hint == 'indexed_enum':
                 columns.append({"key": key, "type": TYPE_STRING, "enum": const_val.split('|'), "indexed": True})
             elif type_hint == 'enum':
@@ -262,67 +391,437 @@ def _parse_header(header_line: str, aliases: dict) -> tuple[list[dict], dict, in
     return columns, constants, explicit_rows
 
 
-def _decode_tabular(lines: list[str], aliases: dict) -> list[dict]:
-    columns, constants, explicit_rows = _parse_header(lines[0], aliases)
-    
-    data = []
-    auto_inc_counters = {col["key"]: 0 for col in columns if col["type"] == TYPE_AUTO_INCREMENT}
-    
-    constant_obj = _unflatten_object(constants)
-    
-    def process_row(tokens: list[str]) -> dict:
-        flat_row = {}
-        token_idx = 0
-        
-        for col in columns:
-            key = col["key"]
-            if col["type"] == TYPE_AUTO_INCREMENT:
-                 auto_inc_counters[key] += 1
-                 flat_row[key] = auto_inc_counters[key]
-                 continue
-                 
-            if token_idx < len(tokens):
-                token = tokens[token_idx]
-                token_idx += 1
-                
-                if token == MARKER_NULL:
-                    flat_row[key] = None
-                elif col["enum"]:
-                    if col.get("indexed"):
-                        try:
-                            idx = int(token)
-                            flat_row[key] = _decode_string(col["enum"][idx]) if idx < len(col["enum"]) else token
-                        except ValueError:
-                            flat_row[key] = _decode_string(token)
-                    else:
-                        flat_row[key] = _decode_string(token)
-                elif col["type"] == TYPE_BOOLEAN:
-                    flat_row[key] = token == '1'
-                elif col["type"] in (TYPE_INTEGER, TYPE_NUMBER):
-                    try:
-                        if key not in flat_row: # Don't overwrite if auto-inc (logic separation)
-                             flat_row[key] = float(token) if '.' in token else int(token)
-                    except ValueError:
-                        flat_row[key] = token
-                else:
-                    flat_row[key] = _decode_string(token)
-            else:
-                flat_row[key] = None # Output exhausted?
-                
-        row_obj = _unflatten_object(flat_row)
-        _deep_merge(row_obj, constant_obj)
-        return row_obj
+def _opens_table(part: str) -> bool:
+    # `key:[...` starts a sub-table column; enum values and constants may
+    # contain ':[' too, but only after their '=', '!' or '@'
+    key, bracket, _ = part.partition(':[')
+    return bool(bracket) and not key.startswith('@') and '=' not in key and '!' not in key
+
+
+def _header_parts(header_line: str) -> list[str]:
+    # Whitespace-separated header parts, with each sub-table's bracketed
+    # header kept in one part
+    parts = header_line.split()
+    if ':[' not in header_line:
+        return parts
+    merged = []
+    depth = 0
+    for part in parts:
+        if depth > 0:
+            merged[-1] += " " + part
+            depth += part.count('[') - part.count(']')
+        else:
+            merged.append(part)
+            if _opens_table(part):
+                depth = part.count('[') - part.count(']')
+    return merged
+
+
+def _decode_tabular(lines: list[str], aliases: dict, select: Iterable[str] | None = None,
+                    where: dict[str, Any] | None = None) -> list[dict]:
+    profile = _current_profile()
+    if profile is not None:
+        return _decode_tabular_profiled(lines, aliases, select, where, profile)
+    return list(_iter_tabular(lines[0], lines[1:], aliases, select, where))
 
+
+def _decode_tabular_profiled(lines: list[str], aliases: dict, select: Iterable[str] | None,
+                             where: dict[str, Any] | None, profile: Profile) -> list[dict]:
+    # Same result as _decode_tabular, one phase at a time over all rows
+    with profile.phase("decode.header"):
+        columns, constants, explicit_rows = _parse_header(lines[0], aliases)
+    if explicit_rows or select is not None or where or any(col["type"] == TYPE_TABLE for col in columns):
+        with profile.phase("decode.rows"):
+            rows = list(_iter_rows(columns, constants, explicit_rows, lines[1:], 0, select, where))
+    else:
+        convert_row = _compile_row_converter(columns)
+        build_row = _compile_row_builder([col["key"] for col in columns], constants)
+        with profile.phase("decode.tokenize"):
+            token_rows = [_tokenize_row(line) for line in map(str.strip, lines[1:]) if line]
+        with profile.phase("decode.convert"):
+            value_rows = [convert_row(tokens, index) for index, tokens in enumerate(token_rows)]
+        with profile.phase("decode.unflatten"):
+            rows = list(map(build_row, value_rows))
+    profile.rows["decode"] += len(rows)
+    return rows
+
+
+def _iter_tabular(header_line: str, lines: Iterable[str], aliases: dict, select: Iterable[str] | None = None,
+                  where: dict[str, Any] | None = None) -> Iterator[dict]:
+    columns, constants, explicit_rows = _parse_header(header_line, aliases)
+    return _iter_rows(columns, constants, explicit_rows, lines, 0, select, where)
+
+
+def _iter_rows(columns: list[dict], constants: dict, explicit_rows: int, lines: Iterable[str],
+               start: int = 0, select: Iterable[str] | None = None,
+               where: dict[str, Any] | None = None) -> Iterator[dict]:
+    # start is the number of rows before these lines; it drives i+ values
+    if select is not None or where:
+        yield from _iter_selected(columns, constants, explicit_rows, lines, start, select, where)
+        return
+    yield from _iter_compiled(_compile_row_decoder(columns, constants), explicit_rows, lines, start)
+
+
+def _iter_compiled(decode_row: Callable[[list[str], int], dict], explicit_rows: int, lines: Iterable[str],
+                   start: int = 0) -> Iterator[dict]:
     if explicit_rows > 0:
         # Generate N rows (only auto-incs and constants typically)
-        for _ in range(explicit_rows):
-            data.append(process_row([]))
+        for index in range(explicit_rows):
+            yield decode_row([], index)
     else:
-        for line in lines[1:]:
+        index = start
+        for line in lines:
             line = line.strip()
             if not line:
                 continue
+            yield decode_row(_tokenize_row(line), index)
+            index += 1
+
+
+def _iter_selected(columns: list[dict], constants: dict, explicit_rows: int, lines: Iterable[str],
+                   start: int, select: Iterable[str] | None, where: dict[str, Any] | None) -> Iterator[dict]:
+    # Rows failing `where` are dropped before anything else is converted;
+    # i+ still counts every row, kept or not
+    decode_row, width = _compile_selection(columns, constants, select, where)
+
+    if explicit_rows > 0:
+        rows = (decode_row([], index) for index in range(explicit_rows))
+        yield from (row for row in rows if row is not None)
+        return
+    index = start
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if width is None:
             tokens = _tokenize_row(line)
-            data.append(process_row(tokens))
-            
-    return data
+        else:
+            tokens = _tokenize_prefix(line, width) if width else []
+        row = decode_row(tokens, index)
+        if row is not None:
+            yield row
+        index += 1
+
+
+def _cell_decoder(col: dict) -> Callable[[str], Any]:
+    if col["enum"]:
+        enum = [_decode_string(v) for v in col["enum"]]
+        if col.get("indexed"):
+            by_token = {str(i): value for i, value in enumerate(enum)}
+
+            def decode_cell(token):
+                value = by_token.get(token)
+                if value is not None:
+                    return value
+                if token == MARKER_NULL:
+                    return None
+                try:
+                    idx = int(token)
+                except ValueError:
+                    return _decode_cell_string(token)
+                return enum[idx] if idx < len(enum) else token
+        else:
+            def decode_cell(token):
+                return None if token == MARKER_NULL else _decode_cell_string(token)
+    elif col["type"] == TYPE_BOOLEAN:
+        def decode_cell(token):
+            return None if token == MARKER_NULL else token == BOOL_TRUE
+    elif col["type"] == TYPE_TABLE:
+        # _compile_cell_reader has already put the decoded child rows in place of the count
+        def decode_cell(token):
+            return None if token == MARKER_NULL else token
+    elif col["type"] in (TYPE_INTEGER, TYPE_NUMBER):
+        def decode_cell(token):
+            if token == MARKER_NULL:
+                return None
+            try:
+                return float(token) if '.' in token else int(token)
+            except ValueError:
+                # A stray non-number, quoted by the encoder if it had to be
+                return token.replace('\\"', '"')
+    else:
+        def decode_cell(token):
+            if token == MARKER_NULL:
+                return None
+            # _decode_cell_string, inlined
+            text = token.replace("_", " ")
+            return text if '\\"' not in text else text.replace('\\"', '"')
+    return decode_cell
+
+
+def _compile_nesting(paths: tuple[tuple[str, ...], ...]) -> Callable[[list], dict]:
+    # Turns values, one per key path, into nested dicts. The paths are
+    # walked once per header into steps (dict slot, key, value index or -1
+    # to open a new dict in the next slot) listed in first-seen key order,
+    # so rows are built without splitting keys or probing for sub-dicts.
+    plan = {}
+    for index, path in enumerate(paths):
+        node = plan
+        for part in path[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        node[path[-1]] = index
+
+    steps = []
+    opened = 0
+
+    def walk(node: dict, slot: int):
+        nonlocal opened
+        for key, entry in node.items():
+            if isinstance(entry, dict):
+                opened += 1
+                steps.append((slot, key, -1))
+                walk(entry, opened)
+            else:
+                steps.append((slot, key, entry))
+    walk(plan, 0)
+    steps = tuple(steps)
+
+    def build(values: list) -> dict:
+        row = {}
+        nodes = [row]
+        for slot, key, index in steps:
+            if index < 0:
+                child = nodes[slot][key] = {}
+                nodes.append(child)
+            else:
+                nodes[slot][key] = values[index]
+        return row
+    return build
+
+
+def _compile_row_decoder(columns: list[dict], constants: dict) -> Callable[[list[str], int], dict]:
+    decode_row = _compile_cells_decoder(columns, constants)
+    if not any(col["type"] == TYPE_TABLE for col in columns):
+        return decode_row
+    read_cells = _compile_cell_reader(columns)
+
+    def decode_nested(tokens: list[str], index: int) -> dict:
+        return decode_row(read_cells(tokens, 0)[0], index)
+    return decode_nested
+
+
+def _compile_cells_decoder(columns: list[dict], constants: dict) -> Callable[[list, int], dict]:
+    # Per-column decisions are resolved once per header; each row is then
+    # converted token by token and assembled from precomputed key paths.
+    # This is _compile_row_converter and _compile_row_builder fused into one
+    # closure, which saves two calls per row on narrow tables. Sub-table
+    # cells must already hold their child rows (see _compile_cell_reader).
+    keys = tuple(col["key"] for col in columns)
+    converters = tuple(_cell_decoder(col) for col in columns if col["type"] != TYPE_AUTO_INCREMENT)
+    auto_positions = tuple(i for i, col in enumerate(columns) if col["type"] == TYPE_AUTO_INCREMENT)
+    width = len(converters)
+    padding = [MARKER_NULL] * width
+    nest, flat_constants, constant_values = _row_layout(keys, constants)
+
+    def decode_row(tokens: list[str], index: int) -> dict:
+        if len(tokens) < width:
+            tokens = tokens + padding[len(tokens):]
+        values = [convert(token) for convert, token in zip(converters, tokens)]
+        for position in auto_positions:
+            values.insert(position, index + 1)
+        if nest is None:
+            row = dict(zip(keys, values))
+        else:
+            values.extend(constant_values)
+            row = nest(values)
+        if flat_constants:
+            row.update(flat_constants)
+        return row
+    return decode_row
+
+
+def _compile_cell_reader(columns: list[dict]) -> Callable[[list, int], tuple[list, int]]:
+    # The cells of the row whose tokens start at tokens[start], with every
+    # sub-table count replaced by the list of child rows it announces, and
+    # the position just past the row. Child rows follow the row's own cells
+    # in column order, each followed in turn by its own child rows.
+    consuming = [col for col in columns if col["type"] != TYPE_AUTO_INCREMENT]
+    width = len(consuming)
+    padding = [MARKER_NULL] * width
+    tables = []
+    for position, col in enumerate(consuming):
+        if col["type"] == TYPE_TABLE:
+            child_columns, child_constants = col["table"]
+            tables.append((position, _compile_cell_reader(child_columns),
+                           _compile_cells_decoder(child_columns, child_constants)))
+
+    def read_cells(tokens: list, start: int) -> tuple[list, int]:
+        cells = tokens[start:start + width]
+        if len(cells) < width:
+            cells += padding[len(cells):]
+        cursor = start + width
+        for position, read_child, decode_child in tables:
+            token = cells[position]
+            if token == MARKER_NULL:
+                continue
+            children = []
+            for index in range(int(token)):
+                child_cells, cursor = read_child(tokens, cursor)
+                children.append(decode_child(child_cells, index))
+            cells[position] = children
+        return cells, cursor
+    return read_cells
+
+
+def _compile_row_converter(columns: list[dict]) -> Callable[[list[str], int], list]:
+    converters = tuple(_cell_decoder(col) for col in columns if col["type"] != TYPE_AUTO_INCREMENT)
+    auto_positions = tuple(i for i, col in enumerate(columns) if col["type"] == TYPE_AUTO_INCREMENT)
+    width = len(converters)
+    padding = [MARKER_NULL] * width
+
+    def convert_row(tokens: list[str], index: int) -> list:
+        if len(tokens) < width:
+            tokens = tokens + padding[len(tokens):]
+        values = [convert(token) for convert, token in zip(converters, tokens)]
+        for position in auto_positions:
+            values.insert(position, index + 1)
+        return values
+    return convert_row
+
+
+def _compile_row_builder(keys: list[str], constants: dict) -> Callable[[list], dict]:
+    keys = tuple(keys)
+    nest, flat_constants, constant_values = _row_layout(keys, constants)
+
+    def build_row(values: list) -> dict:
+        if nest is None:
+            row = dict(zip(keys, values))
+        else:
+            row = nest(values + constant_values)
+        if flat_constants:
+            row.update(flat_constants)
+        return row
+    return build_row
+
+
+def _row_layout(keys: tuple[str, ...], constants: dict) -> tuple[Callable[[list], dict] | None, dict, list]:
+    # How a row dict is assembled from its column values: a nesting builder
+    # (None when every key is flat), constants to update() in, and constant
+    # values to append before nesting. Nested constants go through the
+    # builder so that every row gets sub-dicts of its own.
+    if any('.' in key for key in constants):
+        path_keys = (*keys, *constants)
+        flat_constants = {}
+        constant_values = list(constants.values())
+    else:
+        path_keys = keys
+        flat_constants = constants
+        constant_values = []
+    if not any('.' in key for key in path_keys):
+        return None, flat_constants, constant_values
+    return _compile_nesting(tuple(tuple(key.split('.')) for key in path_keys)), flat_constants, constant_values
+
+
+def _resolve_selection(keys: list[str], select: Iterable[str]) -> set[str]:
+    # A name picks the column itself or everything nested under it
+    if isinstance(select, str):
+        select = [select]
+    chosen = set()
+    for name in select:
+        prefix = name + '.'
+        matched = [key for key in keys if key == name or key.startswith(prefix)]
+        if not matched:
+            raise KeyError(name)
+        chosen.update(matched)
+    return chosen
+
+
+def _compile_cell_check(convert: Callable[[str], Any], predicate: Callable[[Any], bool],
+                        memoize: bool) -> Callable[[str], bool]:
+    if not memoize:
+        return lambda token: predicate(convert(token))
+    # Enum and boolean columns repeat a handful of tokens; each is tested once
+    memo = {}
+
+    def check(token):
+        result = memo.get(token)
+        if result is None:
+            result = memo[token] = bool(predicate(convert(token)))
+        return result
+    return check
+
+
+def _compile_selection(columns: list[dict], constants: dict, select: Iterable[str] | None,
+                       where: dict[str, Any] | None) -> tuple[Callable[[list[str], int], dict | None], int | None]:
+    # Like _compile_row_decoder, but only converts the tokens that are
+    # tested or kept. Returns the row function and how many leading tokens
+    # it reads (None for all of them, when child rows of sub-tables follow);
+    # rows failing a test come back as None.
+    keys = [col["key"] for col in columns]
+    chosen = _resolve_selection(keys + list(constants), select) if select is not None else None
+
+    positions = {}
+    for col in columns:
+        if col["type"] != TYPE_AUTO_INCREMENT:
+            positions[col["key"]] = len(positions)
+    by_key = {col["key"]: col for col in columns}
+
+    token_checks = []
+    index_checks = []
+    table_checks = []
+    reject_all = False
+    for key, expected in (where or {}).items():
+        predicate = expected if callable(expected) else (lambda value, expected=expected: value == expected)
+        if key in by_key:
+            col = by_key[key]
+            if col["type"] == TYPE_AUTO_INCREMENT:
+                index_checks.append(predicate)
+            elif col["type"] == TYPE_TABLE:
+                table_checks.append((positions[key], predicate))
+            else:
+                memoize = bool(col["enum"]) or col["type"] == TYPE_BOOLEAN
+                token_checks.append((positions[key], _compile_cell_check(_cell_decoder(col), predicate, memoize), memoize))
+        elif key in constants:
+            if not predicate(constants[key]):
+                reject_all = True
+        else:
+            raise KeyError(key)
+    # Memoized checks are the cheapest, so they run first
+    token_checks.sort(key=lambda item: not item[2])
+    token_checks = tuple((position, check) for position, check, _ in token_checks)
+
+    outputs = [(positions.get(col["key"], -1), col) for col in columns if chosen is None or col["key"] in chosen]
+    out_keys = tuple(col["key"] for _, col in outputs)
+    out_positions = tuple(position for position, _ in outputs)
+    converters = tuple(_cell_decoder(col) if position >= 0 else None for position, col in outputs)
+    selected_constants = {key: value for key, value in constants.items() if chosen is None or key in chosen}
+
+    width = max([position + 1 for position in out_positions] + [position + 1 for position, _ in token_checks], default=0)
+    padding = [MARKER_NULL] * width
+    nest, flat_constants, constant_values = _row_layout(out_keys, selected_constants)
+    # Child rows are read, once the row's own cells have passed their tests,
+    # only when a sub-table is kept or tested; otherwise they are left unsplit
+    read_cells = None
+    if table_checks or any(col["type"] == TYPE_TABLE for _, col in outputs):
+        read_cells = _compile_cell_reader(columns)
+
+    def decode_row(tokens: list[str], index: int) -> dict | None:
+        if reject_all:
+            return None
+        if len(tokens) < width:
+            tokens = tokens + padding[len(tokens):]
+        for position, check in token_checks:
+            if not check(tokens[position]):
+                return None
+        for predicate in index_checks:
+            if not predicate(index + 1):
+                return None
+        if read_cells is not None:
+            tokens = read_cells(tokens, 0)[0]
+            for position, predicate in table_checks:
+                if not predicate(tokens[position] if tokens[position] != MARKER_NULL else None):
+                    return None
+        values = [index + 1 if position < 0 else convert(tokens[position])
+                  for position, convert in zip(out_positions, converters)]
+        if nest is None:
+            row = dict(zip(out_keys, values))
+        else:
+            values.extend(constant_values)
+            row = nest(values)
+        if flat_constants:
+            row.update(flat_constants)
+        return row
+    return decode_row, width if read_cells is None else None
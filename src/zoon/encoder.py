@@ -1,14 +1,37 @@
-from typing import Any
+import io
+import random
+from typing import IO, Any
 from collections import Counter
+from concurrent.futures import Executor
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice, repeat
+from .profiling import Profile, _current_profile
 from .types import (
-    TYPE_STRING, TYPE_TEXT, TYPE_INTEGER, TYPE_NUMBER, TYPE_BOOLEAN, TYPE_AUTO_INCREMENT,
+    TYPE_STRING, TYPE_TEXT, TYPE_INTEGER, TYPE_NUMBER, TYPE_BOOLEAN, TYPE_AUTO_INCREMENT, TYPE_TABLE,
     MARKER_NULL,
     BOOL_TRUE, BOOL_FALSE, INLINE_BOOL_TRUE, INLINE_BOOL_FALSE
 )
 
 
-def encode(data: Any) -> str:
+STREAM_WINDOW = 1000
+STREAM_CHUNK = 1000
+STATS_BLOCK = 1024
+
+
+def encode(data: Any, workers: int | None = None, executor: Executor | None = None,
+           max_tokens: int | None = None, tokenizer: Any = None,
+           sample: int | None = None, sampling: str = "head") -> str:
+    if max_tokens is not None:
+        if workers is not None or executor is not None:
+            raise ValueError("max_tokens cannot be combined with workers or executor")
+        from .tokens import encode_within
+        return encode_within(data, max_tokens, tokenizer)[0]
     if isinstance(data, list) and len(data) > 0 and all(isinstance(item, dict) for item in data):
+        if workers is not None or executor is not None:
+            from .parallel import encode_parallel
+            return encode_parallel(data, workers, executor, sample, sampling)
+        if sample is not None:
+            return _encode_sampled(data, sample, sampling)
         return _encode_tabular(data)
     elif isinstance(data, dict):
         return _encode_inline(data)
@@ -18,46 +41,183 @@ def encode(data: Any) -> str:
         return _encode_value(data)
 
 
-def _infer_type(values: list[Any]) -> str:
-    non_null = [v for v in values if v is not None]
-    if not non_null:
-        return TYPE_STRING
-    
-    first = non_null[0]
-    if isinstance(first, bool):
-        return TYPE_BOOLEAN
-    elif isinstance(first, int):
-        if all(isinstance(v, int) for v in non_null):
-            return TYPE_INTEGER
-        return TYPE_NUMBER
-    elif isinstance(first, float):
-        return TYPE_NUMBER
-    return TYPE_STRING
-
-
-def _is_auto_increment(values: list[Any]) -> bool:
-    if len(values) < 2:
-        return False
-    try:
-        int_vals = [int(v) for v in values if v is not None]
-        if len(int_vals) < 2:
-            return False
-        for i in range(1, len(int_vals)):
-            if int_vals[i] != int_vals[i - 1] + 1:
-                return False
-        return True
-    except (ValueError, TypeError):
-        return False
-
-
-def _detect_enum(values: list[Any], row_count: int) -> tuple[list[str] | None, bool]:
-    if not values:
-        return None, False
-    str_values = [str(v) for v in values if v is not None]
-    if len(str_values) < 2:
-        return None, False
-    unique = sorted(list(dict.fromkeys(str_values)))
-    if len(unique) <= len(str_values) // 2 and len(unique) <= 10:
+class _ColumnStats:
+    # Everything inference needs to know about one column, gathered in a
+    # single streaming pass over blocks of rows. Each check is dropped as
+    # soon as the data rules it out.
+
+    __slots__ = ("rows", "first", "constant", "kind", "all_int", "sequence", "distinct", "str_count", "total_len",
+                 "lists")
+
+    def __init__(self):
+        self.rows = 0
+        self.first = None
+        self.constant = True
+        self.kind = None  # type of the first non-null value decides the column type
+        self.all_int = True
+        self.sequence = True
+        self.distinct = {}
+        self.str_count = 0
+        self.total_len = 0
+        self.lists = None  # every list seen, while the column can still be a sub-table
+
+    def add(self, values: list, start: int):
+        # values holds this column for rows start..start+len(values)-1
+        if start != self.rows:
+            # Rows without the key read as None
+            self.constant = self.sequence = False
+        if start == 0:
+            self.first = values[0]
+        self.rows = start + len(values)
+
+        if self.constant:
+            self.constant = values.count(self.first) == len(values)
+
+        types = set(map(type, values))
+        has_null = type(None) in types
+        types.discard(type(None))
+        if not types:
+            self.sequence = False
+            return
+        if self.kind is None:
+            first = next(v for v in values if v is not None)
+            if isinstance(first, bool):
+                self.kind = TYPE_BOOLEAN
+            elif isinstance(first, int):
+                self.kind = TYPE_INTEGER
+            elif isinstance(first, float):
+                self.kind = TYPE_NUMBER
+            elif _is_table_value(first):
+                self.kind = TYPE_TABLE
+                self.lists = []
+            else:
+                self.kind = TYPE_STRING
+
+        if self.kind == TYPE_TABLE:
+            lists = values if not has_null else [v for v in values if v is not None]
+            if types == {list} and all(isinstance(item, dict) for value in lists for item in value):
+                self.lists.extend(lists)
+                return
+            self._as_strings()
+
+        if self.kind == TYPE_INTEGER:
+            if self.all_int:
+                self.all_int = all(issubclass(t, int) for t in types)
+            if self.sequence:
+                # i+ columns are rebuilt from the row number, so only 1..N qualifies
+                self.sequence = not has_null and types == {int} and values == list(range(start + 1, self.rows + 1))
+        elif self.kind == TYPE_STRING:
+            self._add_strings(values, types, has_null)
+
+    def _add_strings(self, values: list, types: set, has_null: bool):
+        if types == {str}:
+            strings = values if not has_null else [v for v in values if v is not None]
+        else:
+            strings = [v if type(v) is str else str(v) for v in values if v is not None]
+        self.str_count += len(strings)
+        self.total_len += sum(map(len, strings))
+        if self.distinct is not None:
+            self.distinct.update(dict.fromkeys(strings))
+            if len(self.distinct) > 10:
+                self.distinct = None
+
+    def _as_strings(self):
+        # Not a sub-table after all: catch up on the string statistics of
+        # the lists seen so far
+        lists, self.lists = self.lists, None
+        self.kind = TYPE_STRING
+        if lists:
+            self._add_strings(lists, {list}, False)
+
+    def result(self, row_count: int) -> tuple[bool, Any]:
+        # (True, value) for a constant, (False, column info) otherwise
+        complete = self.rows == row_count
+        if self.kind == TYPE_TABLE:
+            info = _table_info(self.lists)
+            if info is not None:
+                return False, info
+            self._as_strings()
+        if row_count > 1 and complete and self.constant and self.first is not None:
+            return True, self.first
+
+        if self.kind == TYPE_INTEGER:
+            if not self.all_int:
+                return False, {"type": TYPE_NUMBER, "enum": None}
+            if complete and self.sequence and row_count >= 2:
+                return False, {"type": TYPE_AUTO_INCREMENT, "enum": None}
+            return False, {"type": TYPE_INTEGER, "enum": None}
+        if self.kind in (TYPE_BOOLEAN, TYPE_NUMBER):
+            return False, {"type": self.kind, "enum": None}
+
+        if self.distinct is not None and self.str_count >= 2:
+            enum_values, indexed = _choose_enum(sorted(self.distinct), self.str_count, row_count)
+            if enum_values:
+                return False, {"type": TYPE_STRING, "enum": enum_values, "indexed": indexed}
+        if self.total_len / max(1, self.str_count) > 30:
+            return False, {"type": TYPE_TEXT, "enum": None}
+        return False, {"type": TYPE_STRING, "enum": None}
+
+
+def _collect_stats(stats: dict[str, _ColumnStats], block: list[dict], start: int, only: set[str] | None = None):
+    present = set().union(*block)
+    for key in present if only is None else present & only:
+        column = stats.get(key)
+        if column is None:
+            column = stats[key] = _ColumnStats()
+        column.add(list(map(dict.get, block, repeat(key))), start)
+
+
+def _schema_from_stats(stats: dict[str, _ColumnStats], row_count: int) -> tuple[dict, list[str], dict, dict[str, str]]:
+    constant_fields, column_info = _decide_columns(stats, row_count)
+    active_keys = list(column_info)
+    return constant_fields, active_keys, column_info, _detect_aliases(active_keys)
+
+
+def _decide_columns(stats: dict[str, _ColumnStats], row_count: int) -> tuple[dict, dict]:
+    constant_fields = {}
+    column_info = {}
+    for key in sorted(stats):
+        is_constant, result = stats[key].result(row_count)
+        if is_constant:
+            constant_fields[key] = result
+        else:
+            column_info[key] = result
+    return constant_fields, column_info
+
+
+def _is_table_value(value: Any) -> bool:
+    # A list of dicts (or an empty list) can be written as sub-table rows
+    return type(value) is list and all(isinstance(item, dict) for item in value)
+
+
+def _table_info(lists: list[list[dict]]) -> dict | None:
+    # A column of lists of dicts becomes a sub-table with a header of its
+    # own, inferred over the elements of all the lists. None when that
+    # header could not be read back (unbalanced brackets in its values).
+    children = [_flatten_object(item) for value in lists for item in value]
+    constant_fields, column_info = _decide_columns(_full_stats(children), len(children))
+    # i+ restarts at 1 in every list
+    numbers = [index + 1 for value in lists for index in range(len(value))]
+    for key, info in column_info.items():
+        if info["type"] in (TYPE_INTEGER, TYPE_AUTO_INCREMENT):
+            cells = [child.get(key) for child in children]
+            sequence = len(children) >= 2 and cells == numbers and all(type(v) is int for v in cells)
+            info["type"] = TYPE_AUTO_INCREMENT if sequence else TYPE_INTEGER
+    depth = 0
+    for char in " ".join(_header_parts(constant_fields, list(column_info), column_info, {})):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth < 0:
+                return None
+    if depth:
+        return None
+    return {"type": TYPE_TABLE, "enum": None, "table": (constant_fields, column_info)}
+
+
+def _choose_enum(unique: list[str], value_count: int, row_count: int) -> tuple[list[str] | None, bool]:
+    if len(unique) <= value_count // 2 and len(unique) <= 10:
         avg_len = sum(len(o) for o in unique) / len(unique)
         literal_cost = avg_len * row_count
         index_cost = len("|".join(unique)) + row_count * 2
@@ -70,6 +230,20 @@ def _encode_string(value: str) -> str:
     return value.replace(" ", "_")
 
 
+def _encode_cell_value(value: Any) -> str:
+    # _encode_value for a row cell, where a string has to stay one token:
+    # quotes are escaped, and an empty string or one starting with '['
+    # (which would read as a list) is quoted
+    if type(value) is not str:
+        return _encode_value(value)
+    text = value.replace(" ", "_")
+    if '"' in text:
+        text = text.replace('"', '\\"')
+    if not text or text[0] == "[":
+        return '"' + text + '"'
+    return text
+
+
 def _encode_value(value: Any, for_inline: bool = False) -> str:
     if value is None:
         return MARKER_NULL
@@ -85,7 +259,7 @@ def _encode_value(value: Any, for_inline: bool = False) -> str:
         return _encode_inline(value)
     if isinstance(value, list):
         return _encode_simple_list(value)
-    return str(value)
+    return _encode_string(str(value))
 
 
 def _encode_simple_list(data: list) -> str:
@@ -114,6 +288,12 @@ def _encode_inline_content(data: dict) -> str:
 
 
 def _flatten_object(obj: dict, prefix: str = "") -> dict:
+    if not prefix:
+        for value in obj.values():
+            if isinstance(value, dict):
+                break
+        else:
+            return obj  # Already flat; callers only read the result
     result = {}
     for key, value in obj.items():
         new_key = f"{prefix}.{key}" if prefix else key
@@ -198,64 +378,12 @@ def _apply_alias(field: str, aliases: dict[str, str]) -> str:
     return field
 
 
-def _encode_tabular(data: list[dict]) -> str:
-    if not data:
-        return ""
-    
-    flattened_data = [_flatten_object(row) for row in data]
-    # Infer schema from all keys (union)
-    all_keys = set()
-    for row in flattened_data:
-        all_keys.update(row.keys())
-    keys = sorted(list(all_keys))
-    
-    # 1. Detect Constants
-    constant_fields = {}
-    active_keys = []
-    
-    if len(flattened_data) > 1:
-        for key in keys:
-            first_val = flattened_data[0].get(key)
-            is_constant = True
-            for row in flattened_data:
-                if row.get(key) != first_val:
-                    is_constant = False
-                    break
-            
-            # Don't hoist IDs if they look like auto-inc candidates?
-            # Actually constant ID is constant. Auto-inc is handled later.
-            if is_constant and first_val is not None:
-                constant_fields[key] = first_val
-            else:
-                active_keys.append(key)
-    else:
-        active_keys = keys
+def _infer_schema(flattened_data: list[dict]) -> tuple[dict, list[str], dict, dict[str, str]]:
+    return _schema_from_stats(_full_stats(flattened_data), len(flattened_data))
 
-    # 2. Type Inference on Active Keys
-    column_info = {}
-    for key in active_keys:
-        values = [row.get(key) for row in flattened_data]
-        base_type = _infer_type(values)
-        
-        if base_type == TYPE_INTEGER and _is_auto_increment(values):
-            column_info[key] = {"type": TYPE_AUTO_INCREMENT, "enum": None}
-        elif base_type == TYPE_STRING:
-            enum_values, indexed = _detect_enum(values, len(flattened_data))
-            if enum_values:
-                column_info[key] = {"type": TYPE_STRING, "enum": enum_values, "indexed": indexed}
-            else:
-                avg_len = sum(len(str(v)) for v in values if v is not None) / max(1, len([v for v in values if v is not None]))
-                if avg_len > 30:
-                    column_info[key] = {"type": TYPE_TEXT, "enum": None}
-                else:
-                    column_info[key] = {"type": TYPE_STRING, "enum": None}
-        else:
-            column_info[key] = {"type": base_type, "enum": None}
 
-    # 3. Detect Aliases on Active Keys
-    aliases = _detect_aliases(active_keys)
-    
-    # 4. Generate Header
+def _encode_header(constant_fields: dict, active_keys: list[str], column_info: dict,
+                   aliases: dict[str, str], row_count: int) -> str:
     lines = []
     
     # Alias definitions
@@ -265,8 +393,20 @@ def _encode_tabular(data: list[dict]) -> str:
             alias_parts.append(f"%{alias}={prefix}")
         lines.append(" ".join(alias_parts))
     
-    header_parts = ["#"]
+    header_parts = ["#", *_header_parts(constant_fields, active_keys, column_info, aliases)]
+
+    # Row Count +N
+    if not _consuming_keys(active_keys, column_info) and row_count > 0:
+        header_parts.append(f"+{row_count}")
     
+    lines.append(" ".join(header_parts))
+    return "\n".join(lines)
+
+
+def _header_parts(constant_fields: dict, active_keys: list[str], column_info: dict,
+                  aliases: dict[str, str]) -> list[str]:
+    header_parts = []
+
     # Constants
     if constant_fields:
         for key, val in constant_fields.items():
@@ -285,56 +425,484 @@ def _encode_tabular(data: list[dict]) -> str:
         
         if info["type"] == TYPE_AUTO_INCREMENT:
             header_parts.append(f"{aliased}:{TYPE_AUTO_INCREMENT}")
+        elif info["type"] == TYPE_TABLE:
+            # Sub-table header inside the brackets; its keys are never aliased
+            child_constants, child_info = info["table"]
+            child_parts = " ".join(_header_parts(child_constants, list(child_info), child_info, {}))
+            header_parts.append(f"{aliased}:[{child_parts}]")
         elif info["enum"]:
             separator = "!" if info.get("indexed") else "="
-            enum_str = "|".join(info["enum"])
+            enum_str = "|".join(_encode_string(v) for v in info["enum"])
             header_parts.append(f"{aliased}{separator}{enum_str}")
         else:
             header_parts.append(f"{aliased}:{info['type']}")
+    return header_parts
 
-    # Row Count +N
-    has_consuming = any(column_info[k]["type"] != TYPE_AUTO_INCREMENT for k in active_keys)
-    if not has_consuming and len(flattened_data) > 0:
-        header_parts.append(f"+{len(flattened_data)}")
-    
-    lines.append(" ".join(header_parts))
+
+def _consuming_keys(active_keys: list[str], column_info: dict) -> list[str]:
+    return [k for k in active_keys if column_info[k]["type"] != TYPE_AUTO_INCREMENT]
+
+
+def _cell_encoder(info: dict) -> Callable[[Any], str]:
+    kind = info["type"]
+    if info["enum"] and info.get("indexed"):
+        index = {value: str(i) for i, value in enumerate(info["enum"])}
+
+        def encode_cell(value):
+            if value is None:
+                return MARKER_NULL
+            idx = index.get(str(value))
+            return idx if idx is not None else _encode_cell_value(value)
+    elif info["enum"]:
+        def encode_cell(value):
+            return MARKER_NULL if value is None else _encode_cell_value(value)
+    elif kind == TYPE_BOOLEAN:
+        def encode_cell(value):
+            if value is None:
+                return MARKER_NULL
+            return BOOL_TRUE if value else BOOL_FALSE
+    elif kind == TYPE_TABLE:
+        # The cell holds the child row count; the child rows go at the end of the line
+        def encode_cell(value):
+            return MARKER_NULL if value is None else str(len(value))
+    elif kind in (TYPE_INTEGER, TYPE_NUMBER):
+        def encode_cell(value):
+            if value is None:
+                return MARKER_NULL
+            if isinstance(value, (int, float)):
+                return str(value)
+            # A stray non-number reads back as is, provided it stays one token
+            text = str(value)
+            if text and " " not in text and '"' not in text and text[0] != "[":
+                return text
+            return '"' + text.replace('"', '\\"') + '"'
+    elif kind == TYPE_TEXT:
+        def encode_cell(value):
+            if value is None:
+                return MARKER_NULL
+            if isinstance(value, list):
+                return _encode_simple_list(value)
+            return '"' + str(value).replace('"', '\\"') + '"'
+    else:
+        def encode_cell(value):
+            return MARKER_NULL if value is None else _encode_cell_value(value)
+    return encode_cell
+
+
+def _compile_row_encoder(keys: list[str], column_info: dict) -> Callable[[dict], str]:
+    encoders = [_cell_encoder(column_info[key]) for key in keys]
+    pairs = list(zip(keys, encoders))
+
+    def encode_row(row: dict) -> str:
+        get = row.get
+        return " ".join([encode_cell(get(key)) for key, encode_cell in pairs])
+
+    tails = [(key, _tail_encoder(column_info[key])) for key in keys if column_info[key]["type"] == TYPE_TABLE]
+    if not tails:
+        return encode_row
+
+    def encode_nested(row: dict) -> str:
+        line = encode_row(row)
+        get = row.get
+        for key, encode_tail in tails:
+            tail = encode_tail(get(key))
+            if tail:
+                line += " " + tail
+        return line
+    return encode_nested
+
+
+def _tail_encoder(info: dict) -> Callable[[list | None], str]:
+    # The cells of a sub-table's child rows, one after another, as they
+    # follow the parent row's own cells
+    child_constants, child_info = info["table"]
+    consuming = _consuming_keys(list(child_info), child_info)
+    if not consuming:
+        return lambda value: ""
+    encode_child = _compile_row_encoder(consuming, child_info)
+
+    def encode_tail(value: list | None) -> str:
+        if not value:
+            return ""
+        return " ".join([encode_child(_flatten_object(child)) for child in value])
+    return encode_tail
+
+
+def _compile_row_check(constant_fields: dict, column_info: dict) -> Callable[[dict, int], bool]:
+    # Whether a flattened row can be written under an already chosen header
+    # and still decode back to itself. Types are matched exactly; anything
+    # unusual is reported as not fitting.
+    known = set(constant_fields) | set(column_info)
+    constants = list(constant_fields.items())
+    typed = []
+    members = []
+    auto_keys = []
+    tables = []
+    inline_keys = []
+    for key, info in column_info.items():
+        kind = info["type"]
+        if kind == TYPE_AUTO_INCREMENT:
+            auto_keys.append(key)
+        elif kind == TYPE_TABLE:
+            tables.append((key, _compile_table_check(info)))
+        elif info["enum"] and info.get("indexed"):
+            typed.append((key, {str}))
+            members.append((key, set(info["enum"])))
+        elif kind == TYPE_BOOLEAN:
+            typed.append((key, {bool}))
+        elif kind == TYPE_INTEGER:
+            typed.append((key, {int}))
+        elif kind == TYPE_NUMBER:
+            typed.append((key, {int, float}))
+        else:
+            typed.append((key, {str, list}))
+            inline_keys.append(key)
+
+    def row_fits(row: dict, index: int) -> bool:
+        if not row.keys() <= known:
+            return False
+        get = row.get
+        for key, value in constants:
+            if get(key) != value:
+                return False
+        for key, allowed in typed:
+            value = get(key)
+            if value is not None and type(value) not in allowed:
+                return False
+        for key, allowed in members:
+            value = get(key)
+            if value is not None and value not in allowed:
+                return False
+        for key in auto_keys:
+            value = get(key)
+            if type(value) is not int or value != index + 1:
+                return False
+        for key, table_fits in tables:
+            value = get(key)
+            if value is not None and not table_fits(value):
+                return False
+        for key in inline_keys:
+            # Written inline, a list of dicts would come back as a string
+            value = get(key)
+            if type(value) is list and _is_table_value(value):
+                return False
+        return True
+    return row_fits
+
+
+def _compile_table_check(info: dict) -> Callable[[Any], bool]:
+    # Whether a non-null value can be written as rows of a sub-table
+    child_fits = _compile_row_check(*info["table"])
+
+    def table_fits(value: Any) -> bool:
+        return type(value) is list and all(
+            type(child) is dict and child_fits(_flatten_object(child), index) for index, child in enumerate(value)
+        )
+    return table_fits
+
+
+def _serialize_rows(rows: list[dict], keys: list[str], column_info: dict) -> str:
+    return "\n".join(map(_compile_row_encoder(keys, column_info), rows))
+
+
+def _encode_tabular(data: list[dict], serialize: Callable[[list[dict], list[str], dict], str] = _serialize_rows) -> str:
+    if not data:
+        return ""
+    profile = _current_profile()
+    if profile is not None:
+        return _encode_tabular_profiled(data, profile, serialize)
     
-    header_block = "\n".join(lines)
+    flattened_data = [_flatten_object(row) for row in data]
+    constant_fields, active_keys, column_info, aliases = _infer_schema(flattened_data)
+    header_block = _encode_header(constant_fields, active_keys, column_info, aliases, len(flattened_data))
     
-    if not has_consuming:
+    consuming = _consuming_keys(active_keys, column_info)
+    if not consuming:
         return header_block + "\n"
 
-    rows = []
-    for row in flattened_data:
-        row_parts = []
-        for key in active_keys:
-            info = column_info[key]
-            if info["type"] == TYPE_AUTO_INCREMENT:
-                continue
-                
-            value = row.get(key)
-            if value is None:
-                row_parts.append(MARKER_NULL)
-            elif info["enum"]:
-                if info.get("indexed"):
-                    idx = info["enum"].index(str(value)) if str(value) in info["enum"] else -1
-                    row_parts.append(str(idx) if idx >= 0 else _encode_value(value))
-                else:
-                    row_parts.append(_encode_value(value))
-            elif info["type"] == TYPE_BOOLEAN:
-                row_parts.append(BOOL_TRUE if value else BOOL_FALSE)
-            elif info["type"] in (TYPE_INTEGER, TYPE_NUMBER):
-                row_parts.append(str(value))
-            elif isinstance(value, list):
-                 row_parts.append(_encode_simple_list(value))
-            elif info["type"] == TYPE_TEXT:
-                row_parts.append('"' + str(value).replace('"', '\\"') + '"')
-            else:
-                row_parts.append(_encode_value(value))
-        
-        if row_parts:
-            rows.append(" ".join(row_parts))
+    return header_block + "\n" + serialize(flattened_data, consuming, column_info)
+
+
+def _encode_tabular_profiled(data: list[dict], profile: Profile,
+                             serialize: Callable[[list[dict], list[str], dict], str] = _serialize_rows) -> str:
+    # Same steps and output as _encode_tabular, timed one by one. The default
+    # serializer is replaced by one that works a column at a time so each
+    # column's size can be reported; any other (e.g. the parallel one) is
+    # timed as is and the column sizes are measured afterwards.
+    from .tokens import _resolve_tokenizer
+    count = _resolve_tokenizer(profile.tokenizer)
+
+    with profile.phase("encode.flatten"):
+        flattened_data = [_flatten_object(row) for row in data]
+    with profile.phase("encode.stats"):
+        stats = {}
+        for start in range(0, len(flattened_data), STATS_BLOCK):
+            _collect_stats(stats, flattened_data[start:start + STATS_BLOCK], start)
+    with profile.phase("encode.columns"):
+        constant_fields, column_info = _decide_columns(stats, len(flattened_data))
+        active_keys = list(column_info)
+    with profile.phase("encode.aliases"):
+        aliases = _detect_aliases(active_keys)
+    with profile.phase("encode.header"):
+        header_block = _encode_header(constant_fields, active_keys, column_info, aliases, len(flattened_data))
+    consuming = _consuming_keys(active_keys, column_info)
+    if serialize is _serialize_rows:
+        with profile.phase("encode.serialize"):
+            cells, tails = _column_cells(flattened_data, consuming, column_info)
+            lines = list(map(" ".join, zip(*cells.values())))
+            for column in tails.values():
+                lines = [line + " " + tail if tail else line for line, tail in zip(lines, column)]
+            body = "\n".join(lines)
+    else:
+        with profile.phase("encode.serialize"):
+            body = serialize(flattened_data, consuming, column_info) if consuming else ""
+        cells, tails = _column_cells(flattened_data, consuming, column_info)
+
+    profile.rows["encode"] += len(data)
+    profile.decisions = {key: "constant" for key in constant_fields}
+    profile.decisions.update((key, _describe_column(column_info[key])) for key in active_keys)
+    profile.aliases = dict(aliases)
+    profile.header = {"bytes": len(header_block.encode("utf-8")), "tokens": count(header_block)}
+    profile.columns = {}
+    for key, column in cells.items():
+        text = " ".join(column + [tail for tail in tails.get(key, ()) if tail])
+        profile.columns[key] = {"bytes": len(text.encode("utf-8")), "tokens": count(text)}
+
+    if not consuming:
+        return header_block + "\n"
+    return header_block + "\n" + body
+
+
+def _column_cells(rows: list[dict], keys: list[str], column_info: dict) -> tuple[dict, dict]:
+    cells = {key: list(map(_cell_encoder(column_info[key]), map(dict.get, rows, repeat(key))))
+             for key in keys}
+    tails = {key: list(map(_tail_encoder(column_info[key]), map(dict.get, rows, repeat(key))))
+             for key in keys if column_info[key]["type"] == TYPE_TABLE}
+    return cells, tails
+
+
+def _describe_column(info: dict) -> str:
+    if info["enum"]:
+        return "indexed enum" if info.get("indexed") else "enum"
+    return {
+        TYPE_AUTO_INCREMENT: "auto-increment", TYPE_TEXT: "text", TYPE_STRING: "string",
+        TYPE_INTEGER: "integer", TYPE_NUMBER: "number", TYPE_BOOLEAN: "boolean", TYPE_TABLE: "sub-table",
+    }[info["type"]]
+
+
+def _sample_indices(row_count: int, size: int, sampling: str) -> list[int]:
+    if sampling == "head":
+        return list(range(size))
+    if sampling == "reservoir":
+        # Fixed seed: the same data always gets the same header
+        return sorted(random.Random(0).sample(range(row_count), size))
+    raise ValueError(f"unknown sampling {sampling!r}; use 'head' or 'reservoir'")
+
+
+def _infer_sample(flattened_data: list[dict], indices: list[int]) -> tuple[dict, dict]:
+    sample = [flattened_data[i] for i in indices]
+    stats = {}
+    for start in range(0, len(sample), STATS_BLOCK):
+        _collect_stats(stats, sample[start:start + STATS_BLOCK], start)
+    constant_fields, column_info = _decide_columns(stats, len(sample))
+
+    if indices[-1] != len(indices) - 1:
+        # Sampled rows are not contiguous, so i+ is checked against their positions
+        for key, info in column_info.items():
+            if info["type"] == TYPE_INTEGER and len(sample) >= 2 and all(
+                type(row.get(key)) is int and row[key] == index + 1 for index, row in zip(indices, sample)
+            ):
+                column_info[key] = {"type": TYPE_AUTO_INCREMENT, "enum": None}
+    return constant_fields, column_info
+
+
+def _compile_block_check(constant_fields: dict, column_info: dict) -> Callable[[list[dict], int], set[str]]:
+    # Column-at-a-time counterpart of _compile_row_check: returns the keys a
+    # block of rows (the first one at row `start`) contradicts, including
+    # keys the schema does not have. Constants must match in type too.
+    known = set(constant_fields) | set(column_info)
+    null = type(None)
+    checks = []
+    for key, value in constant_fields.items():
+        def check(values, start, value=value, kind=type(value)):
+            return values.count(value) == len(values) and set(map(type, values)) == {kind}
+        checks.append((key, check))
+    for key, info in column_info.items():
+        kind = info["type"]
+        if kind == TYPE_AUTO_INCREMENT:
+            def check(values, start):
+                return set(map(type, values)) == {int} and values == list(range(start + 1, start + len(values) + 1))
+        elif kind == TYPE_TABLE:
+            def check(values, start, table_fits=_compile_table_check(info)):
+                return all(value is None or table_fits(value) for value in values)
+        elif info["enum"] and info.get("indexed"):
+            def check(values, start, members=set(info["enum"]) | {None}):
+                return set(map(type, values)) <= {str, null} and set(values) <= members
         else:
-            rows.append("") # Empty row
+            allowed = {
+                TYPE_BOOLEAN: {bool, null}, TYPE_INTEGER: {int, null}, TYPE_NUMBER: {int, float, null},
+            }.get(kind, {str, list, null})
+
+            def check(values, start, allowed=allowed):
+                types = set(map(type, values))
+                if list in types and any(map(_is_table_value, values)):
+                    # Could be a sub-table when inferred from every row
+                    return False
+                return types <= allowed
+        checks.append((key, check))
+
+    def block_misfits(block: list[dict], start: int) -> set[str]:
+        misfits = set().union(*block) - known
+        for key, check in checks:
+            if not check(list(map(dict.get, block, repeat(key))), start):
+                misfits.add(key)
+        return misfits
+    return block_misfits
+
+
+def _encode_sampled(data: list[dict], sample: int, sampling: str = "head",
+                    serialize: Callable[[list[dict], list[str], dict], str] = _serialize_rows) -> str:
+    # Columns are decided from `sample` rows. Every block is then checked
+    # against those decisions as it is serialized; if any block contradicts
+    # them, only the contradicted columns are re-inferred from all rows
+    # (which widens types, demotes enums and un-hoists constants as needed)
+    # and the rows are serialized again. Any serializer other than the
+    # default (e.g. the parallel one) runs once, after all blocks are checked.
+    if sample < 1:
+        raise ValueError("sample must be positive")
+    flattened_data = [_flatten_object(row) for row in data]
+    row_count = len(flattened_data)
+    if sample >= row_count:
+        constant_fields, column_info = _decide_columns(_full_stats(flattened_data), row_count)
+    else:
+        constant_fields, column_info = _infer_sample(flattened_data, _sample_indices(row_count, sample, sampling))
+
+    consuming = _consuming_keys(list(column_info), column_info)
+    block_misfits = _compile_block_check(constant_fields, column_info)
+    encode_row = _compile_row_encoder(consuming, column_info)
+    interleave = serialize is _serialize_rows
+    pieces = []
+    contradicted = set()
+    for start in range(0, row_count, STATS_BLOCK):
+        block = flattened_data[start:start + STATS_BLOCK]
+        contradicted |= block_misfits(block, start)
+        if interleave and not contradicted and consuming:
+            pieces.append("\n".join(map(encode_row, block)))
+
+    if contradicted:
+        stats = _full_stats(flattened_data, contradicted)
+        redone_constants, redone_info = _decide_columns(stats, row_count)
+        constant_fields = {key: value for key, value in constant_fields.items() if key not in contradicted}
+        constant_fields.update(redone_constants)
+        column_info = {key: info for key, info in column_info.items() if key not in contradicted}
+        column_info.update(redone_info)
+        constant_fields = dict(sorted(constant_fields.items()))
+        column_info = dict(sorted(column_info.items()))
+        consuming = _consuming_keys(list(column_info), column_info)
+    if contradicted or not interleave:
+        pieces = [serialize(flattened_data, consuming, column_info)] if consuming else []
+
+    active_keys = list(column_info)
+    header_block = _encode_header(constant_fields, active_keys, column_info, _detect_aliases(active_keys), row_count)
+    if not consuming:
+        return header_block + "\n"
+    return header_block + "\n" + "\n".join(pieces)
+
+
+def _full_stats(flattened_data: list[dict], only: set[str] | None = None) -> dict[str, _ColumnStats]:
+    stats = {}
+    for start in range(0, len(flattened_data), STATS_BLOCK):
+        _collect_stats(stats, flattened_data[start:start + STATS_BLOCK], start, only)
+    return stats
+
+
+def encode_iter(data: Iterable[dict], window: int = STREAM_WINDOW, chunk_size: int = STREAM_CHUNK) -> Iterator[str]:
+    # The header is inferred from the first `window` rows; later rows are
+    # serialized as they arrive and must fit that header.
+    if window < 1 or chunk_size < 1:
+        raise ValueError("window and chunk_size must be positive")
+    rows = iter(data)
+    head = [_flatten_streamed(row) for row in islice(rows, window)]
+    if not head:
+        yield "[]"
+        return
+
+    constant_fields, active_keys, column_info, aliases = _infer_schema(head)
+    consuming = _consuming_keys(active_keys, column_info)
+    row_fits = _compile_row_check(constant_fields, column_info)
+
+    def tail() -> Iterator[dict]:
+        for index, row in enumerate(rows, len(head)):
+            yield _flatten_streamed(row, index, row_fits, len(head))
+
+    if not consuming:
+        # Rows carry no data, only the count ends up in the header
+        row_count = len(head) + sum(1 for _ in tail())
+        yield _encode_header(constant_fields, active_keys, column_info, aliases, row_count) + "\n"
+        return
+
+    yield _encode_header(constant_fields, active_keys, column_info, aliases, len(head)) + "\n"
+    encode_row = _compile_row_encoder(consuming, column_info)
+    separator = ""
+    for source in (iter(head), tail()):
+        while True:
+            chunk = list(map(encode_row, islice(source, chunk_size)))
+            if not chunk:
+                break
+            yield separator + "\n".join(chunk)
+            separator = "\n"
+
+
+def _flatten_streamed(row: Any, index: int = 0, row_fits: Callable[[dict, int], bool] | None = None,
+                      window: int = 0) -> dict:
+    # A streamed row, flattened and checked against the header inferred
+    # from the first `window` rows (if row_fits is given)
+    if not isinstance(row, dict):
+        raise TypeError("encode_iter expects an iterable of dicts")
+    flat = _flatten_object(row)
+    if row_fits is not None and not row_fits(flat, index):
+        raise ValueError(
+            f"row {index} does not fit the header inferred from the first {window} rows; increase window"
+        )
+    return flat
+
+
+def encode_to(data: Iterable[dict], fp: IO, window: int = STREAM_WINDOW, chunk_size: int = STREAM_CHUNK) -> None:
+    write = _text_writer(fp)
+    for chunk in encode_iter(data, window, chunk_size):
+        write(chunk)
+
+
+def encode_into(data: Any, fp: IO, chunk_size: int = STREAM_CHUNK) -> None:
+    # Writes exactly what encode(data) returns, chunk_size rows at a time,
+    # so the output is never held in memory as one string. The header is
+    # still inferred from all rows first.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    write = _text_writer(fp)
+    if (_current_profile() is not None
+            or not (isinstance(data, list) and data and all(isinstance(row, dict) for row in data))):
+        write(encode(data))
+        return
 
-    return header_block + "\n" + "\n".join(rows)
+    flattened_data = [_flatten_object(row) for row in data]
+    constant_fields, active_keys, column_info, aliases = _infer_schema(flattened_data)
+    write(_encode_header(constant_fields, active_keys, column_info, aliases, len(flattened_data)) + "\n")
+    consuming = _consuming_keys(active_keys, column_info)
+    if not consuming:
+        return
+    encode_row = _compile_row_encoder(consuming, column_info)
+    separator = ""
+    for start in range(0, len(flattened_data), chunk_size):
+        write(separator + "\n".join(map(encode_row, flattened_data[start:start + chunk_size])))
+        separator = "\n"
+
+
+def _text_writer(fp: IO) -> Callable[[str], Any]:
+    # Binary writers (files opened "wb", sockets, sys.stdout.buffer) get
+    # UTF-8; anything else is handed the text
+    mode = getattr(fp, "mode", "")
+    if not isinstance(fp, io.TextIOBase) and (
+            isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or (isinstance(mode, str) and "b" in mode)):
+        return lambda text: fp.write(text.encode("utf-8"))
+    return fp.write
@@ -0,0 +1,196 @@
+import os
+import pickle
+import re
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import chain, repeat
+from collections.abc import Iterable
+from typing import Any
+from .encoder import encode, _encode_tabular, _encode_sampled, _serialize_rows
+from .decoder import decode, _parse_alias_line, _parse_header, _iter_rows, _resolve_selection
+from .types import TYPE_AUTO_INCREMENT
+
+# Below this many rows per worker the pool costs more than it saves
+PARALLEL_MIN_ROWS = 10_000
+
+
+# Lines that hold nothing but whitespace are skipped by the decoder
+_BLANK_LINE = re.compile(r'^[^\S\n]*$', re.MULTILINE)
+
+
+def _free_threaded() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _make_executor(workers: int) -> Executor:
+    # Threads only help when there is no GIL to share
+    if _free_threaded():
+        return ThreadPoolExecutor(workers)
+    return ProcessPoolExecutor(workers)
+
+
+def _resolve_workers(workers: int | None) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    return workers
+
+
+def _chunk_size(count: int, workers: int) -> int:
+    # A few chunks per worker keeps the pool busy when chunks finish unevenly
+    return max(PARALLEL_MIN_ROWS, -(-count // (workers * 4)))
+
+
+def _serialize_parallel(rows: list[dict], keys: list[str], column_info: dict, executor: Executor, workers: int) -> str:
+    size = _chunk_size(len(rows), workers)
+    if len(rows) <= size:
+        return _serialize_rows(rows, keys, column_info)
+    chunks = [rows[i:i + size] for i in range(0, len(rows), size)]
+    return "\n".join(executor.map(_serialize_rows, chunks, repeat(keys), repeat(column_info)))
+
+
+def encode_parallel(data: Any, workers: int | None = None, executor: Executor | None = None,
+                    sample: int | None = None, sampling: str = "head") -> str:
+    # The header is inferred once in this process; only row serialization
+    # is split into ordered chunks, so the output matches encode(data).
+    if not (isinstance(data, list) and data and all(isinstance(item, dict) for item in data)):
+        return encode(data)
+    workers = _resolve_workers(workers)
+    encode_rows = _encode_tabular if sample is None else partial(_encode_sampled, sample=sample, sampling=sampling)
+    if executor is not None:
+        return encode_rows(data, serialize=partial(_serialize_parallel, executor=executor, workers=workers))
+    if workers == 1 or len(data) < 2 * PARALLEL_MIN_ROWS:
+        return encode_rows(data)
+    with _make_executor(workers) as pool:
+        return encode_rows(data, serialize=partial(_serialize_parallel, executor=pool, workers=workers))
+
+
+def _split_preamble(text: str) -> tuple[dict, str | None, int]:
+    # Alias lines and the '#' header, scanned without splitting the body
+    aliases = {}
+    pos = 0
+    while pos <= len(text):
+        end = text.find('\n', pos)
+        if end == -1:
+            end = len(text)
+        line = text[pos:end].strip()
+        if line:
+            if line.startswith('%'):
+                _parse_alias_line(line, aliases)
+            elif line.startswith('#'):
+                return aliases, line, end + 1
+            else:
+                break
+        pos = end + 1
+    return aliases, None, 0
+
+
+def _body_chunks(text: str, start: int, count: int) -> list[str]:
+    size = max(1, (len(text) - start) // count)
+    chunks = []
+    while start < len(text):
+        end = text.find('\n', start + size)
+        if end == -1:
+            end = len(text)
+        chunks.append(text[start:end])
+        start = end + 1
+    return chunks
+
+
+def _row_count(chunk: str) -> int:
+    return chunk.count('\n') + 1 - len(_BLANK_LINE.findall(chunk))
+
+
+def _decode_chunk(header_line: str, aliases: dict, chunk: str, start: int,
+                  select: list[str] | None = None, where: dict[str, Any] | None = None) -> list[dict]:
+    columns, constants, explicit_rows = _parse_header(header_line, aliases)
+    return list(_iter_rows(columns, constants, explicit_rows, chunk.split('\n'), start, select, where))
+
+
+def decode_parallel(zoon_string: str, workers: int | None = None, executor: Executor | None = None,
+                    columns: Iterable[str] | None = None, where: dict[str, Any] | None = None) -> Any:
+    # The header is parsed here; body lines are cut into chunks at newline
+    # boundaries, each chunk knowing how many rows precede it so i+ values
+    # come out right, and decoded chunks are concatenated in order.
+    workers = _resolve_workers(workers)
+    aliases, header_line, body_start = _split_preamble(zoon_string)
+    select = [columns] if isinstance(columns, str) else list(columns) if columns is not None else None
+    if header_line is None:
+        return decode(zoon_string, columns=select, where=where)
+    header_columns, constants, explicit_rows = _parse_header(header_line, aliases)
+
+    line_count = zoon_string.count('\n', body_start) + 1
+    chunk_count = min(workers * 4, line_count // PARALLEL_MIN_ROWS)
+    if explicit_rows or chunk_count < 2 or (executor is None and workers == 1):
+        return decode(zoon_string, columns=select, where=where)
+
+    chunks = _body_chunks(zoon_string, body_start, chunk_count)
+    starts = [0] * len(chunks)
+    if any(col["type"] == TYPE_AUTO_INCREMENT for col in header_columns):
+        total = 0
+        for i, chunk in enumerate(chunks):
+            starts[i] = total
+            total += _row_count(chunk)
+
+    # Predicates that cannot be pickled (lambdas, closures) cannot reach
+    # worker processes: workers then decode the tested fields too, and the
+    # rows are filtered and trimmed here
+    local_where = None
+    if where and not _picklable(where):
+        local_where = where
+        where = None
+        keys = [col["key"] for col in header_columns] + list(constants)
+        for key in local_where:
+            if key not in keys:
+                raise KeyError(key)
+        if select is not None:
+            kept = _resolve_selection(keys, select)
+            dropped = [key.split('.') for key in local_where if key not in kept]
+            select = select + list(local_where)
+
+    args = (repeat(header_line), repeat(aliases), chunks, starts, repeat(select), repeat(where))
+    if executor is not None:
+        rows = list(chain.from_iterable(executor.map(_decode_chunk, *args)))
+    else:
+        with _make_executor(workers) as pool:
+            rows = list(chain.from_iterable(pool.map(_decode_chunk, *args)))
+    if local_where is None:
+        return rows
+
+    checks = [(key.split('.'), expected if callable(expected) else (lambda value, expected=expected: value == expected))
+              for key, expected in local_where.items()]
+    rows = [row for row in rows if all(predicate(_path_value(row, path)) for path, predicate in checks)]
+    if select is not None:
+        for row in rows:
+            for path in dropped:
+                _drop_path(row, path)
+    return rows
+
+
+def _picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _path_value(row: dict, path: list[str]) -> Any:
+    for part in path:
+        row = row[part]
+    return row
+
+
+def _drop_path(row: dict, path: list[str]):
+    # Removes a field and any parent dicts left empty by it
+    parents = [row]
+    for part in path[:-1]:
+        parents.append(parents[-1][part])
+    del parents[-1][path[-1]]
+    for parent, part in zip(reversed(parents[:-1]), reversed(path[:-1])):
+        if parent[part]:
+            break
+        del parent[part]
@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from collections.abc import Iterator
+
+_ACTIVE: ContextVar["Profile | None"] = ContextVar("zoon_profile", default=None)
+
+
+def _current_profile() -> "Profile | None":
+    return _ACTIVE.get()
+
+
+class Profile:
+    # Filled in by every encode()/decode() of a table run inside
+    # `with zoon.profile() as p:`. Phase times add up across calls; the
+    # column decisions and sizes describe the last encode.
+
+    def __init__(self, tokenizer: Any = None):
+        self.tokenizer = tokenizer
+        self.phases: dict[str, float] = {}
+        self.rows: dict[str, int] = {"encode": 0, "decode": 0}
+        self.decisions: dict[str, str] = {}
+        self.aliases: dict[str, str] = {}
+        self.columns: dict[str, dict[str, int]] = {}
+        self.header: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self) -> str:
+        names = [*self.phases, *self.decisions, "header"]
+        width = max(map(len, names)) + 2
+        lines = [f"{name:<{width}} {seconds * 1000:>10.2f} ms" for name, seconds in self.phases.items()]
+        if self.header:
+            lines.append(f"{'header':<{width}} {self.header['bytes']:>10} B {self.header['tokens']:>8} tok")
+        for key, kind in self.decisions.items():
+            size = self.columns.get(key)
+            if size is not None:
+                lines.append(f"{key:<{width}} {size['bytes']:>10} B {size['tokens']:>8} tok  {kind}")
+            else:
+                lines.append(f"{key:<{width}} {'':>23}  {kind}")
+        lines.extend(f"%{alias}={prefix}" for prefix, alias in self.aliases.items())
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"<Profile rows={self.rows} phases={list(self.phases)}>"
+
+
+@contextmanager
+def profile(tokenizer: Any = None) -> Iterator[Profile]:
+    # Profiling is per context (thread or task); code outside the block,
+    # or in other threads, runs the uninstrumented paths
+    current = Profile(tokenizer)
+    token = _ACTIVE.set(current)
+    try:
+        yield current
+    finally:
+        _ACTIVE.reset(token)
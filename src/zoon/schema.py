@@ -0,0 +1,176 @@
+from collections import OrderedDict
+from typing import Any
+from .encoder import (
+    encode, _flatten_object, _infer_schema, _detect_aliases, _encode_header,
+    _consuming_keys, _compile_row_encoder, _compile_row_check
+)
+from .decoder import decode, _parse_alias_line, _parse_header, _decode_string, _iter_rows
+from .types import (
+    TYPE_STRING, TYPE_TEXT, TYPE_INTEGER, TYPE_NUMBER, TYPE_BOOLEAN, TYPE_AUTO_INCREMENT, TYPE_TABLE
+)
+
+_COLUMN_TYPES = (TYPE_STRING, TYPE_TEXT, TYPE_INTEGER, TYPE_NUMBER, TYPE_BOOLEAN, TYPE_AUTO_INCREMENT)
+
+
+class Schema:
+    # Column decisions made once (inferred from a sample batch or declared)
+    # and reused for every encode/decode of same-shaped tables.
+    #
+    # Declared columns use the header spelling: "s", "t", "i", "n", "b",
+    # "i+", "=a|b" for an enum and "!a|b|c" for an indexed enum.
+
+    def __init__(self, columns: dict[str, str], constants: dict[str, Any] | None = None):
+        column_info = {key: _parse_spec(key, spec) for key, spec in columns.items()}
+        active_keys = list(columns)
+        self._setup(dict(constants or {}), active_keys, column_info, _detect_aliases(active_keys))
+
+    @classmethod
+    def infer(cls, data: list[dict]) -> "Schema":
+        if not data or not all(isinstance(row, dict) for row in data):
+            raise ValueError("Schema.infer expects a non-empty list of dicts")
+        return cls._from_parts(*_infer_schema([_flatten_object(row) for row in data]))
+
+    @classmethod
+    def from_header(cls, text: str) -> "Schema":
+        aliases = {}
+        for line in text.strip().split('\n'):
+            line = line.strip()
+            if line.startswith('%'):
+                _parse_alias_line(line, aliases)
+            elif line.startswith('#'):
+                break
+        else:
+            raise ValueError("no '#' header line found")
+
+        columns, constants, _ = _parse_header(line, aliases)
+        column_info = _column_info(columns)
+        prefixes = {prefix: alias for alias, prefix in aliases.items()}
+        return cls._from_parts(constants, list(column_info), column_info, prefixes)
+
+    @classmethod
+    def _from_parts(cls, constant_fields: dict, active_keys: list[str], column_info: dict,
+                    aliases: dict[str, str]) -> "Schema":
+        schema = cls.__new__(cls)
+        schema._setup(constant_fields, active_keys, column_info, aliases)
+        return schema
+
+    def _setup(self, constant_fields: dict, active_keys: list[str], column_info: dict, aliases: dict[str, str]):
+        self.constants = constant_fields
+        self.keys = active_keys
+        self.column_info = column_info
+        self.aliases = aliases
+        self._consuming = _consuming_keys(active_keys, column_info)
+        self._encode_row = _compile_row_encoder(self._consuming, column_info)
+        self._row_fits = _compile_row_check(constant_fields, column_info)
+        self.header = _encode_header(constant_fields, active_keys, column_info, aliases, 0)
+        self._prefix = self.header + "\n"
+        aliases_by_name = {alias: prefix for prefix, alias in aliases.items()}
+        self._columns, self._parsed_constants, _ = _parse_header(self.header.split("\n")[-1], aliases_by_name)
+        self._fragments = None
+        self._fragment_limit = 0
+
+    def cache_rows(self, max_rows: int = 65536) -> "Schema":
+        # Keep the serialized line of recently seen rows, so re-encoding a
+        # mostly unchanged table only serializes the rows that changed.
+        # Keyed on the row's cell values and their types.
+        if max_rows < 1:
+            raise ValueError("max_rows must be positive")
+        self._fragments = OrderedDict()
+        self._fragment_limit = max_rows
+        return self
+
+    def __repr__(self) -> str:
+        return f"Schema.from_header({self.header!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Schema) and self.header == other.header
+
+    def __hash__(self) -> int:
+        return hash(self.header)
+
+    def fits(self, data: list[dict]) -> bool:
+        return all(
+            isinstance(row, dict) and self._row_fits(_flatten_object(row), i)
+            for i, row in enumerate(data)
+        )
+
+    def encode(self, data: list[dict], strict: bool = False) -> str:
+        # Rows that do not fit fall back to a fully inferred encode, or raise
+        # a ValueError when strict.
+        if not data:
+            return encode(data)
+        flattened_data = []
+        row_fits = self._row_fits
+        for index, row in enumerate(data):
+            flat = _flatten_object(row) if isinstance(row, dict) else None
+            if flat is None or not row_fits(flat, index):
+                if strict:
+                    raise ValueError(f"row {index} does not fit the schema")
+                return encode(data)
+            flattened_data.append(flat)
+
+        if not self._consuming:
+            return _encode_header(self.constants, self.keys, self.column_info, self.aliases, len(data)) + "\n"
+        if self._fragments is not None:
+            return self._prefix + "\n".join(map(self._cached_row, flattened_data))
+        return self._prefix + "\n".join(map(self._encode_row, flattened_data))
+
+    def _cached_row(self, row: dict) -> str:
+        values = tuple(map(row.get, self._consuming))
+        types = tuple(map(type, values))
+        if float in types:
+            # 0.0 == -0.0 but they are written differently
+            values = tuple(repr(value) if type(value) is float else value for value in values)
+        key = (values, types)
+        fragments = self._fragments
+        try:
+            line = fragments.get(key)
+        except TypeError:
+            # Unhashable cell (a list)
+            return self._encode_row(row)
+        if line is not None:
+            fragments.move_to_end(key)
+            return line
+        line = fragments[key] = self._encode_row(row)
+        if len(fragments) > self._fragment_limit:
+            fragments.popitem(last=False)
+        return line
+
+    def decode(self, zoon_string: str, strict: bool = False) -> Any:
+        # Documents written with this schema skip header parsing; anything
+        # else goes through the regular decoder unless strict.
+        body = zoon_string.strip()
+        if self._consuming and body.startswith(self._prefix):
+            return list(_iter_rows(self._columns, self._parsed_constants, 0, body[len(self._prefix):].split('\n')))
+        if strict and (self._consuming or not body.startswith(self.header)):
+            raise ValueError("document was not written with this schema")
+        return decode(zoon_string)
+
+
+def _column_info(columns: list[dict]) -> dict:
+    # Encoder column info for parsed header columns
+    column_info = {}
+    for col in columns:
+        if col["enum"]:
+            enum = [_decode_string(v) for v in col["enum"]]
+            column_info[col["key"]] = {"type": TYPE_STRING, "enum": enum, "indexed": col["indexed"]}
+        elif col["type"] == TYPE_TABLE:
+            child_columns, child_constants = col["table"]
+            column_info[col["key"]] = {"type": TYPE_TABLE, "enum": None,
+                                       "table": (child_constants, _column_info(child_columns))}
+        elif col["type"] in _COLUMN_TYPES:
+            column_info[col["key"]] = {"type": col["type"], "enum": None}
+        else:
+            raise ValueError(f"unknown type {col['type']!r} for column {col['key']!r}")
+    return column_info
+
+
+def _parse_spec(key: str, spec: str) -> dict:
+    if spec.startswith("!") or spec.startswith("="):
+        enum = spec[1:].split("|")
+        if not spec[1:]:
+            raise ValueError(f"empty enum for column {key!r}")
+        return {"type": TYPE_STRING, "enum": enum, "indexed": spec.startswith("!")}
+    if spec not in _COLUMN_TYPES:
+        raise ValueError(f"unknown type {spec!r} for column {key!r}")
+    return {"type": spec, "enum": None}
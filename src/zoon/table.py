@@ -0,0 +1,115 @@
+import io
+import mmap
+import os
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from .decoder import _parse_alias_line, _parse_header, _compile_row_decoder, _tokenize_row
+
+# Start of every line that has something other than ASCII whitespace on it
+_LINE_START = re.compile(rb'^[ \t\r\f\v]*[^\s]', re.MULTILINE)
+
+
+class ZoonTable(Sequence):
+    # Read-only view of a tabular ZOON file. The file is memory-mapped, the
+    # header is parsed once, and rows are decoded only when accessed; the
+    # row offset index is built on first use.
+
+    def __init__(self, path: str | os.PathLike):
+        self._file = io.open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            aliases, header_line, self._body_start = _read_preamble(self._data)
+            if header_line is None:
+                raise ValueError(f"{os.fspath(path)!r} is not a tabular ZOON document")
+        except BaseException:
+            self.close()
+            raise
+        self.header = header_line
+        columns, constants, self._explicit_rows = _parse_header(header_line, aliases)
+        self.columns = [col["key"] for col in columns] + list(constants)
+        self._decode_row = _compile_row_decoder(columns, constants)
+        self._offsets = None
+
+    def _index(self) -> array:
+        if self._offsets is None:
+            self._offsets = array("Q", _row_starts(self._data, self._body_start))
+        return self._offsets
+
+    def __len__(self) -> int:
+        if self._explicit_rows:
+            return self._explicit_rows
+        return len(self._index())
+
+    def _row(self, index: int) -> dict:
+        if self._explicit_rows:
+            return self._decode_row([], index)
+        line = _line(self._data, self._index()[index]).strip()
+        return self._decode_row(_tokenize_row(line), index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("ZoonTable index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[dict]:
+        for index in range(len(self)):
+            yield self._row(index)
+
+    def close(self):
+        if isinstance(getattr(self, "_data", None), mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "ZoonTable":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<ZoonTable {self._file.name!r} {self.header!r}>"
+
+
+def _row_starts(data: bytes | mmap.mmap, start: int) -> Iterator[int]:
+    for match in _LINE_START.finditer(data, start):
+        char = data[match.end() - 1]
+        # Non-ASCII first characters may still be (Unicode) whitespace
+        if 0x21 <= char <= 0x7e or _line(data, match.start()).strip():
+            yield match.start()
+
+
+def _line(data: bytes | mmap.mmap, start: int) -> str:
+    end = data.find(b"\n", start)
+    if end == -1:
+        end = len(data)
+    return data[start:end].decode("utf-8")
+
+
+def _read_preamble(data: bytes | mmap.mmap) -> tuple[dict, str | None, int]:
+    aliases = {}
+    pos = 0
+    while pos < len(data):
+        end = data.find(b"\n", pos)
+        if end == -1:
+            end = len(data)
+        line = data[pos:end].decode("utf-8").strip()
+        if line:
+            if line.startswith('%'):
+                _parse_alias_line(line, aliases)
+            elif line.startswith('#'):
+                return aliases, line, end + 1
+            else:
+                break
+        pos = end + 1
+    return aliases, None, 0
+
+
+def open(path: str | os.PathLike) -> ZoonTable:
+    return ZoonTable(path)
@@ -0,0 +1,121 @@
+import re
+from collections.abc import Callable
+from typing import Any
+from .encoder import (
+    encode, _flatten_object, _infer_schema, _encode_header, _consuming_keys, _compile_row_encoder
+)
+
+# Rough BPE pre-tokenization: short letter runs (a leading space or ZOON's
+# '_' joins the word), digit groups of up to three, punctuation runs, and
+# one token per non-ASCII character
+_ESTIMATE_PATTERN = re.compile(r"[ _]?[A-Za-z]{1,8}| ?\d{1,3}|[^\x00-\x7f]| ?[^\w\s]+|_|\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(_ESTIMATE_PATTERN.findall(text))
+
+
+def _resolve_tokenizer(tokenizer: Any) -> Callable[[str], int]:
+    # None: built-in estimate. str: a tiktoken encoding or model name.
+    # Objects with .encode (tiktoken Encoding and friends) count the ids
+    # they return; plain callables may return a count or a token list.
+    if tokenizer is None:
+        return estimate_tokens
+    if isinstance(tokenizer, str):
+        import tiktoken
+        try:
+            tokenizer = tiktoken.get_encoding(tokenizer)
+        except ValueError:
+            tokenizer = tiktoken.encoding_for_model(tokenizer)
+    encode_text = getattr(tokenizer, "encode", None)
+    if encode_text is not None:
+        return lambda text: len(encode_text(text))
+    if callable(tokenizer):
+        def count(text):
+            result = tokenizer(text)
+            return result if isinstance(result, int) else len(result)
+        return count
+    raise TypeError(f"unsupported tokenizer {tokenizer!r}")
+
+
+def count_tokens(text: str, tokenizer: Any = None) -> int:
+    return _resolve_tokenizer(tokenizer)(text)
+
+
+def encode_within(data: list[dict], max_tokens: int, tokenizer: Any = None) -> tuple[str, int]:
+    # Encode as many leading rows as fit in max_tokens; returns the text and
+    # the number of rows it holds. The header is inferred from all rows and
+    # costed once, then each row line is costed as it is serialized until
+    # the budget runs out.
+    count = _resolve_tokenizer(tokenizer)
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise TypeError("encode_within expects a list of dicts")
+    if max_tokens < 0:
+        raise ValueError("max_tokens must be >= 0")
+
+    if not data:
+        return _finish(data, 0, None, max_tokens, count)
+
+    flattened_data = [_flatten_object(row) for row in data]
+    constant_fields, active_keys, column_info, aliases = _infer_schema(flattened_data)
+    consuming = _consuming_keys(active_keys, column_info)
+    if not consuming:
+        # '+N' tables are all header; find the largest N that fits. Any
+        # prefix of such a table has the same columns, so only N changes.
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count(_encode_header(constant_fields, active_keys, column_info, aliases, middle) + "\n") <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return _finish(data, low, None, max_tokens, count)
+
+    header = _encode_header(constant_fields, active_keys, column_info, aliases, len(data))
+    used = count(header)
+    encode_row = _compile_row_encoder(consuming, column_info)
+    lines = []
+    for row in flattened_data:
+        line = encode_row(row)
+        used += count("\n" + line)
+        if used > max_tokens:
+            break
+        lines.append(line)
+    # The built-in estimate never matches across the line breaks between
+    # rows, so for it the running total is already the count of the text
+    return _finish(data, len(lines), (header, lines), max_tokens, count, exact=count is estimate_tokens)
+
+
+def _finish(data: list[dict], rows: int, fallback: tuple[str, list[str]] | None, max_tokens: int,
+            count: Callable[[str], int], exact: bool = False) -> tuple[str, int]:
+    # Per-piece counts only approximate the count of the joined text, so the
+    # result is checked as a whole, once, trimming rows by binary search if
+    # it overflows. encode() of a partial prefix is preferred (its header
+    # fits those rows exactly); the header inferred from every row, which
+    # is valid for any prefix, is the fallback. With every row included the
+    # two are the same text.
+    if rows and fallback is None:
+        # '+N' tables were costed on their exact header
+        return encode(data[:rows]), rows
+    if rows:
+        header, lines = fallback
+
+        def joined(rows: int) -> str:
+            return header + "\n" + "\n".join(lines[:rows])
+
+        if not exact and count(joined(rows)) > max_tokens:
+            low, high = 0, rows - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                if count(joined(middle)) <= max_tokens:
+                    low = middle
+                else:
+                    high = middle - 1
+            rows = low
+        if rows == len(data):
+            return joined(rows), rows
+        if rows:
+            text = encode(data[:rows])
+            return (text if count(text) <= max_tokens else joined(rows)), rows
+    empty = encode([])
+    return (empty if count(empty) <= max_tokens else ""), 0
@@ -9,6 +9,7 @@ TYPE_INTEGER = "i"
 TYPE_NUMBER = "n"
 TYPE_BOOLEAN = "b"
 TYPE_AUTO_INCREMENT = "i+"
+TYPE_TABLE = "[]"
 
 MARKER_NULL = "~"
 
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+import zoon
+
+
+def _rows(n):
+    for i in range(1, n + 1):
+        yield {"id": i, "name": f"User{i}", "meta": {"role": "admin" if i % 3 == 0 else "user"}, "active": i % 2 == 0}
+
+
+async def _arows(n):
+    for row in _rows(n):
+        yield row
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+def test_aencode_iter_matches_encode_iter():
+    data = list(_rows(50))
+    for source in (data, _arows(50)):
+        chunks = asyncio.run(_collect(zoon.aencode_iter(source, window=10, chunk_size=4)))
+        assert chunks == list(zoon.encode_iter(data, window=10, chunk_size=4))
+    assert asyncio.run(_collect(zoon.aencode_iter([]))) == ["[]"]
+
+
+def test_aencode_iter_rejects_row_outside_header():
+    data = list(_rows(10)) + [{"id": 11, "name": "X", "meta": {"role": "user"}, "active": "yes"}]
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(zoon.aencode_iter(data, window=10)))
+
+
+def test_aencode_iter_yields_to_the_loop():
+    ticks = []
+
+    async def main():
+        async def tick():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        before = len(ticks)
+        chunks = await _collect(zoon.aencode_iter(list(_rows(1000)), window=100, chunk_size=50))
+        ticker.cancel()
+        return len(ticks) - before, chunks
+
+    turns, chunks = asyncio.run(main())
+    assert turns >= 10
+    assert zoon.decode("".join(chunks)) == list(_rows(1000))
+
+
+def test_aencode_to_writer_and_adecode_iter_reader():
+    class Writer:
+        def __init__(self):
+            self.data = b""
+            self.drains = 0
+
+        def write(self, data):
+            self.data += data
+
+        async def drain(self):
+            self.drains += 1
+
+    async def main():
+        writer = Writer()
+        await zoon.aencode_to(_arows(30), writer, window=5, chunk_size=10)
+        reader = asyncio.StreamReader()
+        reader.feed_data(writer.data)
+        reader.feed_eof()
+        rows = [row async for row in zoon.adecode_iter(reader, chunk_size=7)]
+        return writer, rows
+
+    writer, rows = asyncio.run(main())
+    assert writer.drains == 5
+    assert rows == list(_rows(30))
+
+
+def test_adecode_iter_columns_where_and_inline():
+    async def lines(text):
+        for line in text.split("\n"):
+            yield line + "\n"
+
+    async def main():
+        text = zoon.encode(list(_rows(20)))
+        admins = [row async for row in zoon.adecode_iter(lines(text), columns=["id"],
+                                                          where={"meta.role": "admin"})]
+        counted = [row async for row in zoon.adecode_iter(lines("# @s=x id:i+ +3"))]
+        inline = [row async for row in zoon.adecode_iter(lines(zoon.encode({"a": 1})))]
+        return admins, counted, inline
+
+    admins, counted, inline = asyncio.run(main())
+    assert admins == [{"id": i} for i in range(3, 21, 3)]
+    assert counted == [{"id": 1, "s": "x"}, {"id": 2, "s": "x"}, {"id": 3, "s": "x"}]
+    assert inline == [{"a": 1}]
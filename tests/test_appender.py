@@ -0,0 +1,63 @@
+import zoon
+
+
+def _rows(start, stop):
+    return [{"id": i, "level": ["info", "warn", "error"][i % 3], "service": "api", "code": i % 7}
+            for i in range(start, stop)]
+
+
+def _read(path):
+    return zoon.decode(path.read_text())
+
+
+def test_append_in_place(tmp_path):
+    path = tmp_path / "log.zoon"
+    path.write_text(zoon.encode(_rows(1, 31)))
+    header = path.read_text().split("\n")[0]
+
+    appender = zoon.ZoonAppender(path)
+    assert appender.append(_rows(31, 35)) is True
+    assert appender.append(_rows(35, 36)) is True
+    assert path.read_text().split("\n")[0] == header
+    assert _read(path) == _rows(1, 36)
+
+    # A second appender counts the existing rows to continue i+
+    assert zoon.ZoonAppender(path).append(_rows(36, 37)) is True
+    assert _read(path) == _rows(1, 37)
+
+
+def test_append_rewrites_on_schema_change(tmp_path):
+    path = tmp_path / "log.zoon"
+    path.write_text(zoon.encode(_rows(1, 31)))
+    appender = zoon.ZoonAppender(path)
+
+    # New indexed enum member, broken constant, then a gap in the ids
+    for row in ({"id": 31, "level": "debug", "service": "api", "code": 1},
+                {"id": 32, "level": "info", "service": "web", "code": 2},
+                {"id": 40, "level": "info", "service": "web", "code": 3}):
+        expected = _read(path) + [row]
+        assert appender.append([row]) is False
+        assert _read(path) == expected
+    assert appender.append([{"id": 41, "level": "debug", "service": "api", "code": 4}]) is True
+
+
+def test_append_widens_int_constant(tmp_path):
+    path = tmp_path / "log.zoon"
+    rows = [{"id": i, "x": 1} for i in range(1, 4)]
+    path.write_text(zoon.encode(rows))
+    assert "@x:1" in path.read_text()
+    assert _read(path) == rows
+
+    appender = zoon.ZoonAppender(path)
+    assert appender.append([{"id": 4, "x": 2}]) is False
+    assert _read(path) == rows + [{"id": 4, "x": 2}]
+
+
+def test_append_new_file_and_row_count_form(tmp_path):
+    path = tmp_path / "ids.zoon"
+    appender = zoon.ZoonAppender(path)
+    assert appender.append([{"id": 1}, {"id": 2}]) is False
+    assert path.read_text() == "# id:i+ +2\n"
+    assert appender.append([{"id": 3}]) is True
+    assert zoon.ZoonAppender(path).append([{"id": 4}]) is True
+    assert path.read_text() == "# id:i+ +4\n"
@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+import zoon
+
+
+def _docs():
+    docs = []
+    for n in range(12):
+        docs.append([{"id": i + 1, "user": {"name": "ab"[i % 2], "age": i * n}, "ok": i % 3 == 0}
+                     for i in range(n % 5)])
+    # Same columns, constants of different types
+    docs += [[{"a": 1}, {"a": 1}], [{"a": 1.0}, {"a": 1.0}], [{"a": True}, {"a": True}], [{"a": [1, 2]}]]
+    docs += [{"inline": 1}, [1, 2], "text", None, [{"id": 1}, {"id": 2}, {"id": 3}]]
+    return docs
+
+
+def test_encode_many_matches_encode():
+    docs = _docs()
+    expected = [zoon.encode(doc) for doc in docs]
+    assert zoon.encode_many(docs) == expected
+    assert zoon.encode_many(iter(docs)) == expected
+    with ThreadPoolExecutor(3) as pool:
+        assert zoon.encode_many(docs, executor=pool) == expected
+
+
+def test_decode_many_matches_decode():
+    texts = [zoon.encode(doc) for doc in _docs()]
+    expected = [zoon.decode(text) for text in texts]
+    assert zoon.decode_many(texts) == expected
+    with ThreadPoolExecutor(3) as pool:
+        assert zoon.decode_many(texts, executor=pool) == expected
+    assert zoon.encode_many([]) == [] and zoon.decode_many([]) == []
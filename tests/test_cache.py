@@ -0,0 +1,64 @@
+import zoon
+
+
+def _rows(n, offset=0):
+    return [{"id": i, "sku": f"P{i + offset}", "price": i * 1.5, "stock": i % 4} for i in range(1, n + 1)]
+
+
+def test_encode_cache_hits_and_keys():
+    cache = zoon.EncodeCache()
+    data = _rows(20)
+    assert cache.encode(data) == zoon.encode(data)
+    assert cache.encode(_rows(20)) == zoon.encode(data)
+    assert cache.info()[:3] == (1, 1, 1)
+
+    # Equal-looking values of different types are different inputs
+    assert cache.encode([{"a": 1}, {"a": 2}]) != cache.encode([{"a": True}, {"a": 2}])
+
+    assert cache.encode(data, key="catalog-v1") == zoon.encode(data)
+    assert cache.encode(None, key="catalog-v1") == zoon.encode(data)
+    assert cache.encode(data, sample=5) == zoon.encode(data, sample=5)
+
+
+def test_encode_cache_keys_on_content():
+    import json
+    from datetime import date
+    cache = zoon.EncodeCache()
+    shared = {"name": "x", "v": 1}
+    built = [{"name": "x", "v": i} for i in range(5)]
+    for first, second in ((built, json.loads(json.dumps(built))), ([shared, shared], [dict(shared), dict(shared)]),
+                          ([{"d": date(2024, 1, 1)}] * 2, [{"d": date(2024, 1, 1)}, {"d": date(2024, 1, 1)}])):
+        cache.clear()
+        cache.encode(first)
+        cache.encode(second)
+        assert cache.info()[:2] == (1, 1)
+
+
+def test_encode_cache_eviction():
+    cache = zoon.EncodeCache(max_entries=2)
+    for n in (1, 2, 3):
+        cache.encode(_rows(n + 1))
+    assert len(cache) == 2
+    cache.encode(_rows(2))
+    assert cache.info().misses == 4
+
+    small = zoon.EncodeCache(max_bytes=len(zoon.encode(_rows(5))) * 2)
+    small.encode(_rows(50))
+    assert len(small) == 0
+    cache.clear()
+    assert cache.info()[:4] == (0, 0, 0, 0)
+
+
+def test_schema_row_cache():
+    schema = zoon.Schema.infer(_rows(30)).cache_rows(max_rows=100)
+    first = schema.encode(_rows(30))
+    changed = _rows(30)
+    changed[4] = {"id": 5, "sku": "X", "price": 2.0, "stock": 1}
+    changed[7] = {"id": 8, "sku": "P8", "price": 12, "stock": 3}
+    assert first == zoon.Schema.infer(_rows(30)).encode(_rows(30))
+    assert schema.encode(changed) == zoon.Schema.infer(_rows(30)).encode(changed)
+
+    # Equal but differently written floats get lines of their own
+    signed = [{"id": 1, "sku": "P1", "price": 0.0, "stock": 1}, {"id": 2, "sku": "P1", "price": -0.0, "stock": 1}]
+    for rows in (signed[:1], signed[1:], signed):
+        assert schema.encode(rows) == zoon.Schema.infer(_rows(30)).encode(rows)
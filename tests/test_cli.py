@@ -0,0 +1,80 @@
+import io
+import json
+import zoon
+from zoon.cli import main
+
+
+def _rows(n):
+    return [{"id": i, "name": f"User {i}", "meta": {"role": "admin" if i % 3 == 0 else "user"}} for i in range(1, n + 1)]
+
+
+def test_encode_json_and_ndjson(tmp_path, capsys):
+    data = _rows(40)
+    (tmp_path / "in.json").write_text(json.dumps(data))
+    (tmp_path / "in.jsonl").write_text("".join(json.dumps(row) + "\n" for row in data))
+
+    assert main(["encode", str(tmp_path / "in.json"), "-o", str(tmp_path / "out.zoon")]) == 0
+    assert (tmp_path / "out.zoon").read_text() == zoon.encode(data) + "\n"
+    for extra in ([], ["--jobs", "2"], ["--sample", "5"]):
+        assert main(["encode", str(tmp_path / "in.jsonl"), *extra]) == 0
+        assert zoon.decode(capsys.readouterr().out) == data
+
+
+def test_encode_jobs_with_sample_runs_in_parallel(tmp_path, monkeypatch, capsys):
+    from concurrent.futures import ThreadPoolExecutor
+    import zoon.parallel
+    pools = []
+    monkeypatch.setattr(zoon.parallel, "PARALLEL_MIN_ROWS", 5)
+
+    def make_executor(workers):
+        pools.append(workers)
+        return ThreadPoolExecutor(workers)
+    monkeypatch.setattr(zoon.parallel, "_make_executor", make_executor)
+    data = _rows(40)
+    (tmp_path / "in.json").write_text(json.dumps(data))
+    assert main(["encode", str(tmp_path / "in.json"), "--jobs", "2", "--sample", "5"]) == 0
+    assert capsys.readouterr().out == zoon.encode(data, sample=5) + "\n"
+    assert pools == [2]
+
+
+def test_encode_ndjson_row_outside_window(monkeypatch, capsys):
+    rows = [{"n": 1}, {"n": 2}, {"n": "x"}]
+    monkeypatch.setattr("sys.stdin", io.StringIO("".join(json.dumps(row) + "\n" for row in rows)))
+    assert main(["encode", "--ndjson", "--sample", "2"]) == 1
+    assert "does not fit" in capsys.readouterr().err
+
+
+def test_decode_json_ndjson_and_columns(tmp_path, capsys):
+    data = _rows(30)
+    path = tmp_path / "in.zoon"
+    path.write_text(zoon.encode(data))
+
+    assert main(["decode", str(path)]) == 0
+    assert capsys.readouterr().out == json.dumps(zoon.decode(path.read_text())) + "\n"
+    assert main(["decode", str(path), "--ndjson", "--columns", "id,meta", "--jobs", "2"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": row["id"], "meta": row["meta"]} for row in data]
+
+    assert main(["decode", str(path), "--columns", "nope"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == "" and "unknown column" in captured.err
+
+
+def test_decode_inline_document_and_stats(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO(zoon.encode({"a": 1, "b": "x y"})))
+    assert main(["decode", "--stats"]) == 0
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {"a": 1, "b": "x y"}
+    assert captured.err.startswith("rows    1 in ")
+    assert "tokens  zoon" in captured.err
+
+
+def test_bad_tokenizer_and_missing_keys_are_reported(tmp_path, capsys):
+    path = tmp_path / "in.json"
+    path.write_text(json.dumps(_rows(3)))
+    assert main(["encode", str(path), "--stats", "--tokenizer", "bogus"]) == 1
+    assert capsys.readouterr().err == "zoon: unknown tokenizer 'bogus'\n"
+
+    (tmp_path / "in.zoon").write_text(zoon.encode(_rows(3)))
+    assert main(["decode", str(tmp_path / "in.zoon"), "--columns", "id,nope"]) == 1
+    assert capsys.readouterr().err == "zoon: unknown column 'nope'\n"
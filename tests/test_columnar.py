@@ -0,0 +1,105 @@
+import pytest
+import zoon
+
+
+def _columns():
+    return {
+        "id": [1, 2, 3, 4],
+        "name": ["Alice", "Bob", "Carol", "Dave"],
+        "role": ["admin", "user", "user", "user"],
+        "active": [True, False, True, None],
+        "region": ["us", "us", "us", "us"],
+        "meta.score": [0.5, 1.25, 2.0, 3.5],
+    }
+
+
+def _rows(columns):
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def test_encode_columns_matches_encode():
+    columns = _columns()
+    assert zoon.encode_columns(columns) == zoon.encode(_rows(columns))
+
+
+def test_encode_columns_roundtrip_nested_key():
+    decoded = zoon.decode(zoon.encode_columns(_columns()))
+    assert decoded[1] == {"id": 2, "name": "Bob", "role": "user", "active": False, "region": "us", "meta": {"score": 1.25}}
+
+
+def test_encode_columns_length_mismatch():
+    with pytest.raises(ValueError):
+        zoon.encode_columns({"a": [1, 2], "b": [1]})
+
+
+def test_encode_columns_numpy():
+    np = pytest.importorskip("numpy")
+    columns = {
+        "id": np.arange(1, 6),
+        "value": np.array([0.5, np.nan, 1.5, 2.5, 3.0]),
+        "flag": np.array([True, False, True, True, False]),
+        "level": np.array(["info", "warn", "info", "info", "warn"]),
+        "unit": np.full(5, 3),
+    }
+    decoded = zoon.decode(zoon.encode_columns(columns))
+    assert [row["id"] for row in decoded] == [1, 2, 3, 4, 5]
+    assert decoded[1]["value"] is None
+    assert decoded[2] == {"id": 3, "value": 1.5, "flag": True, "level": "info", "unit": 3}
+
+
+def test_encode_columns_dataframe():
+    pd = pytest.importorskip("pandas")
+    columns = _columns()
+    df = pd.DataFrame({key: values for key, values in columns.items() if key != "active"})
+    expected = zoon.encode([{k: v for k, v in row.items() if k != "active"} for row in _rows(columns)])
+    assert zoon.encode_columns(df) == expected
+
+
+def _table():
+    return [
+        {"id": i, "level": ["debug", "info", "warn", "error"][i % 4], "count": i * 3, "ok": i % 2 == 0,
+         "note": f"n{i}", "unit": "ms"}
+        for i in range(1, 13)
+    ]
+
+
+def test_decode_columns_list_backend():
+    data = _table()
+    columns = zoon.decode_columns(zoon.encode(data))
+    assert list(columns) == ["count", "id", "level", "note", "ok", "unit"]
+    for key, values in columns.items():
+        assert list(values) == [row[key] for row in data]
+
+
+def test_decode_columns_array_backend():
+    from array import array
+    data = _table()
+    columns = zoon.decode_columns(zoon.encode(data), backend="array")
+    assert columns["id"] == array("q", range(1, 13))
+    assert isinstance(columns["count"], array)
+    assert isinstance(columns["ok"], array)
+    assert isinstance(columns["level"], zoon.Categorical)
+    assert list(columns["level"]) == [row["level"] for row in data]
+    assert columns["note"] == [row["note"] for row in data]
+
+
+def test_decode_columns_nulls_and_stray_values():
+    columns = zoon.decode_columns("# a:i b!x|y|z c:b\n1 0 1\nzz 5 ~\n~ q 0", backend="array")
+    assert columns["a"] == [1, "zz", None]
+    assert list(columns["b"]) == ["x", "5", "q"]
+    assert columns["c"] == [True, None, False]
+
+
+def test_decode_columns_numpy_backend():
+    np = pytest.importorskip("numpy")
+    data = _table()
+    columns = zoon.decode_columns(zoon.encode(data), backend="numpy")
+    assert columns["count"].dtype == np.int64
+    assert columns["ok"].dtype == bool
+    assert columns["level"].codes.dtype == np.int32
+    assert columns["count"].tolist() == [row["count"] for row in data]
+
+
+def test_decode_columns_rejects_non_tabular():
+    with pytest.raises(ValueError):
+        zoon.decode_columns("name=Alice")
@@ -1,3 +1,4 @@
+import pytest
 import zoon
 
 
@@ -41,3 +42,128 @@ Gadget 29.50"""
     result = zoon.decode(encoded)
     assert result[0]["price"] == 19.99
     assert result[1]["price"] == 29.50
+
+
+def test_decode_indexed_enum():
+    encoded = """# id:i+ level!debug|info|warn
+0
+2
+~
+info"""
+    result = zoon.decode(encoded)
+    assert [row["level"] for row in result] == ["debug", "warn", None, "info"]
+    assert [row["id"] for row in result] == [1, 2, 3, 4]
+
+
+def test_decode_nested_columns_with_constants():
+    encoded = """%md=meta.deep
+# @meta.region=us %md.level:i name:s
+1 a
+2 b"""
+    result = zoon.decode(encoded)
+    assert result[1] == {"meta": {"deep": {"level": 2}, "region": "us"}, "name": "b"}
+    assert list(result[1]) == ["meta", "name"] and list(result[1]["meta"]) == ["deep", "region"]
+    assert result[0]["meta"] is not result[1]["meta"]
+
+
+def test_decode_interleaved_nested_keys():
+    encoded = """# a.x:i b:s a.y.z:i a.w:s
+1 p 2 q"""
+    row = zoon.decode(encoded)[0]
+    assert row == {"a": {"x": 1, "y": {"z": 2}, "w": "q"}, "b": "p"}
+    assert list(row) == ["a", "b"] and list(row["a"]) == ["x", "y", "w"]
+
+
+def test_decode_missing_tokens_are_null():
+    encoded = """# a:i b:s c:b
+1"""
+    assert zoon.decode(encoded) == [{"a": 1, "b": None, "c": None}]
+
+
+def test_tokenize_row_fast_and_quoted_paths():
+    from zoon.decoder import _tokenize_row
+    assert _tokenize_row("a  b c") == ["a", "b", "c"]
+    assert _tokenize_row('1 "say \\"hi\\" now" [x,y z] tail') == ["1", 'say \\"hi\\" now', "[x,y z]", "tail"]
+    assert _tokenize_row('a"b [c') == ['a"b', "[c"]
+
+
+def test_decode_columns_and_where():
+    encoded = """%md=meta.deep
+# @meta.region=us id:i+ %md.level:i name:s status!ok|fail
+1 a 0
+2 b 1
+3 "c d" 0"""
+    assert zoon.decode(encoded, columns=["id", "meta.deep"], where={"status": "ok"}) == [
+        {"id": 1, "meta": {"deep": {"level": 1}}},
+        {"id": 3, "meta": {"deep": {"level": 3}}},
+    ]
+    assert zoon.decode(encoded, columns=["name", "meta"], where={"meta.deep.level": lambda v: v > 1}) == [
+        {"name": "b", "meta": {"deep": {"level": 2}, "region": "us"}},
+        {"name": "c d", "meta": {"deep": {"level": 3}, "region": "us"}},
+    ]
+    assert zoon.decode(encoded, columns=["name"], where={"meta.region": "eu"}) == []
+    assert list(zoon.decode_iter(encoded.splitlines(), columns="name", where={"id": 2})) == [{"name": "b"}]
+
+
+def test_decode_sub_table_columns_and_where():
+    encoded = "# id:i+ items:[qty:i sku:s] name:s\n2 a 2 A1 1 B2\n0 b\n1 c 5 C3"
+    assert zoon.decode(encoded, columns=["items"], where={"name": "c"}) == [{"items": [{"qty": 5, "sku": "C3"}]}]
+    assert zoon.decode(encoded, columns="name", where={"items": lambda items: len(items) > 1}) == [{"name": "a"}]
+    assert zoon.decode_columns(encoded)["items"][1] == []
+
+
+def test_decode_unknown_column_raises():
+    with pytest.raises(KeyError):
+        zoon.decode("# a:i\n1", columns=["b"])
+    with pytest.raises(KeyError):
+        zoon.decode("# a:i\n1", where={"b": 1})
+
+
+def test_decode_reuses_compiled_headers():
+    zoon.header_cache_clear()
+    encoded = """%md=meta.deep
+# @meta.region=us id:i+ %md.level:i
+1
+2"""
+    first = zoon.decode(encoded)
+    second = zoon.decode(encoded + "\n3")
+    info = zoon.header_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    assert second[:2] == first
+
+    # Rows (and repeated decodes) never share nested constant dicts
+    second[0]["meta"]["region"] = "eu"
+    assert second[1]["meta"]["region"] == "us"
+    assert zoon.decode(encoded)[0]["meta"] == {"deep": {"level": 1}, "region": "us"}
+
+    zoon.header_cache_clear()
+    assert zoon.header_cache_info().currsize == 0
+
+
+def test_set_header_cache_size():
+    documents = [f"# a:i b{i}:s\n1 x" for i in range(3)]
+    try:
+        zoon.set_header_cache_size(2)
+        for text in documents * 2:
+            zoon.decode(text)
+        info = zoon.header_cache_info()
+        assert (info.maxsize, info.currsize, info.hits) == (2, 2, 0)
+        zoon.set_header_cache_size(0)
+        assert zoon.decode(documents[0]) == [{"a": 1, "b0": "x"}]
+        assert zoon.header_cache_info().currsize == 0
+        with pytest.raises(ValueError):
+            zoon.set_header_cache_size(-1)
+    finally:
+        zoon.set_header_cache_size(256)
+    assert zoon.decoder.HEADER_CACHE_SIZE == zoon.header_cache_info().maxsize == 256
+
+
+def test_decode_bytes_like_input(monkeypatch):
+    monkeypatch.setattr(zoon.decoder, "LINE_BLOCK", 8)
+    data = [{"id": i, "name": f"Zoë {i}", "meta": {"ok": i % 2 == 0}} for i in range(1, 20)]
+    raw = zoon.encode(data).encode("utf-8")
+    for value in (raw, bytearray(raw), memoryview(raw), b"\r\n" + raw.replace(b"\n", b"\r\n") + b"\n"):
+        assert zoon.decode(value) == data
+    assert zoon.decode(raw, columns=["id"], where={"meta.ok": True}) == [{"id": i} for i in range(2, 20, 2)]
+    assert zoon.decode(zoon.encode({"a": "b c"}).encode()) == {"a": "b c"}
+    assert zoon.decode(b"") is None
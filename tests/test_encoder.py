@@ -86,3 +86,36 @@ def test_encode_floats():
     result = zoon.encode(data)
     assert "0.75" in result
     assert "0.92" in result
+
+
+def test_encode_enum_detection():
+    data = [{"level": ["debug", "info", "warn"][i % 3], "tag": f"t{i}"} for i in range(30)]
+    header = zoon.encode(data).split("\n")[0]
+    assert "level!debug|info|warn" in header
+    assert "tag:s" in header
+
+
+def test_encode_sparse_columns_across_blocks():
+    data = [{"id": i + 1, "value": i} for i in range(3000)]
+    data[2500]["extra"] = "late"
+    data[10]["value"] = None
+    encoded = zoon.encode(data)
+    assert "extra:s" in encoded
+    assert zoon.decode(encoded) == [
+        {**row, "extra": row.get("extra")} for row in data
+    ]
+
+
+def test_encode_sampled_matches_full_inference():
+    data = [{"id": i + 1, "level": ["debug", "info", "warn"][i % 3], "host": "web", "value": i} for i in range(3000)]
+    for sampling in ("head", "reservoir"):
+        assert zoon.encode(data, sample=100, sampling=sampling) == zoon.encode(data)
+
+
+def test_encode_sampled_falls_back_on_contradiction():
+    data = [{"id": i + 1, "level": ["debug", "info", "warn"][i % 3], "host": "web", "value": i} for i in range(3000)]
+    data[2000] = {"id": 2001, "level": "error", "host": "db", "value": 2.5, "extra": True}
+    encoded = zoon.encode(data, sample=100)
+    header = encoded.split("\n")[0]
+    assert "host=db|web" in header and "value:n" in header and "extra:b" in header
+    assert zoon.decode(encoded) == zoon.decode(zoon.encode(data))
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import zoon
+import zoon.parallel
+
+
+def _table(n):
+    return [
+        {"id": i, "name": f"U{i}", "level": ["debug", "info", "warn"][i % 3], "score": i / 4,
+         "meta": {"ok": i % 2 == 0, "region": "us"}}
+        for i in range(1, n + 1)
+    ]
+
+
+def test_encode_with_executor_matches_serial(monkeypatch):
+    monkeypatch.setattr(zoon.parallel, "PARALLEL_MIN_ROWS", 7)
+    data = _table(100)
+    with ThreadPoolExecutor(3) as pool:
+        assert zoon.encode(data, executor=pool) == zoon.encode(data)
+
+
+def test_encode_with_process_workers_matches_serial(monkeypatch):
+    monkeypatch.setattr(zoon.parallel, "PARALLEL_MIN_ROWS", 10)
+    data = _table(100)
+    assert zoon.encode(data, workers=2) == zoon.encode(data)
+
+
+def test_encode_sampled_with_executor(monkeypatch):
+    monkeypatch.setattr(zoon.parallel, "PARALLEL_MIN_ROWS", 7)
+    calls = []
+    serialize = zoon.parallel._serialize_parallel
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return serialize(*args, **kwargs)
+    monkeypatch.setattr(zoon.parallel, "_serialize_parallel", counting)
+    data = _table(3000)
+    contradicted = _table(3000)
+    contradicted[2500] = {**contradicted[2500], "level": "error", "extra": 1}
+    with ThreadPoolExecutor(3) as pool:
+        for rows in (data, contradicted):
+            assert zoon.encode(rows, executor=pool, sample=50) == zoon.encode(rows, sample=50)
+    assert len(calls) == 2
+    with pytest.raises(ValueError):
+        zoon.encode(data, workers=2, max_tokens=100)
+
+
+def test_encode_workers_small_or_non_tabular():
+    data = _table(5)
+    assert zoon.encode(data, workers=4) == zoon.encode(data)
+    assert zoon.encode({"a": 1}, workers=4) == zoon.encode({"a": 1})
+
+
+def test_decode_with_executor_matches_serial(monkeypatch):
+    monkeypatch.setattr(zoon.parallel, "PARALLEL_MIN_ROWS", 7)
+    data = _table(100)
+    encoded = zoon.encode(data)
+    with ThreadPoolExecutor(3) as pool:
+        assert zoon.decode(encoded, executor=pool) == data
+
+
+def test_decode_with_process_workers_keeps_auto_increment(monkeypatch):
+    monkeypatch.setattr(zoon.parallel, "PARALLEL_MIN_ROWS", 10)
+    data = _table(100)
+    lines = zoon.encode(data).split("\n")
+    lines.insert(40, "   ")
+    lines.insert(70, "")
+    decoded = zoon.decode("\n".join(lines), workers=2)
+    assert [row["id"] for row in decoded] == list(range(1, 101))
+    assert decoded == data
+
+
+def test_decode_workers_non_tabular():
+    assert zoon.decode("name=Alice age:30", workers=2) == {"name": "Alice", "age": 30}
+
+
+def test_decode_workers_with_columns_and_where(monkeypatch):
+    monkeypatch.setattr(zoon.parallel, "PARALLEL_MIN_ROWS", 10)
+    encoded = zoon.encode(_table(100))
+    cases = [
+        (None, {"id": lambda v: v > 90}),
+        (["name"], {"meta.ok": lambda v: v, "id": lambda v: v % 7 == 0}),
+        (["meta.region", "id"], {"meta.ok": True, "level": "warn"}),
+        (["id"], {"meta.region": lambda v: v == "us", "score": lambda v: v < 5}),
+    ]
+    for columns, where in cases:
+        expected = zoon.decode(encoded, columns=columns, where=where)
+        assert expected
+        assert zoon.decode(encoded, workers=2, columns=columns, where=where) == expected
+        with ThreadPoolExecutor(3) as pool:
+            assert zoon.decode(encoded, executor=pool, columns=columns, where=where) == expected
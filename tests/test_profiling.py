@@ -0,0 +1,54 @@
+import zoon
+
+
+def _rows(n):
+    return [{"id": i, "level": ["info", "warn", "error"][i % 3], "host": "web-1",
+             "meta": {"latency": i * 3, "path": f"/items/{i}"}} for i in range(1, n + 1)]
+
+
+def test_profile_encode_and_decode():
+    data = _rows(30)
+    expected = zoon.encode(data)
+    with zoon.profile() as profile:
+        encoded = zoon.encode(data)
+        decoded = zoon.decode(encoded)
+    assert encoded == expected
+    assert decoded == zoon.decode(expected)
+
+    assert set(profile.phases) == {
+        "encode.flatten", "encode.stats", "encode.columns", "encode.aliases", "encode.header", "encode.serialize",
+        "decode.header", "decode.tokenize", "decode.convert", "decode.unflatten",
+    }
+    assert profile.rows == {"encode": 30, "decode": 30}
+    assert profile.decisions == {"host": "constant", "id": "auto-increment", "level": "indexed enum",
+                                 "meta.latency": "integer", "meta.path": "string"}
+    assert set(profile.columns) == {"level", "meta.latency", "meta.path"}
+    assert profile.columns["level"]["bytes"] == len(" ".join(["0", "2", "1"] * 10))
+    assert "meta.path" in profile.report()
+
+
+def test_profile_is_scoped():
+    with zoon.profile() as profile:
+        pass
+    zoon.decode(zoon.encode(_rows(5)))
+    assert profile.phases == {} and profile.rows == {"encode": 0, "decode": 0}
+
+
+def test_profile_encode_with_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    from zoon.parallel import PARALLEL_MIN_ROWS
+
+    class CountingExecutor(ThreadPoolExecutor):
+        calls = 0
+
+        def map(self, *args, **kwargs):
+            CountingExecutor.calls += 1
+            return super().map(*args, **kwargs)
+
+    data = _rows(3 * PARALLEL_MIN_ROWS)
+    with zoon.profile() as profile, CountingExecutor(2) as pool:
+        encoded = zoon.encode(data, executor=pool, workers=2)
+    assert encoded == zoon.encode(data)
+    assert CountingExecutor.calls == 1
+    assert "encode.serialize" in profile.phases
+    assert profile.columns["level"]["bytes"] == len(" ".join(["0", "2", "1"] * PARALLEL_MIN_ROWS))
@@ -103,3 +103,50 @@ def test_implicit_rows_with_row_count():
     assert "+3" in encoded
     decoded = zoon.decode(encoded)
     assert decoded == data
+
+
+def test_list_of_objects_as_sub_table():
+    data = [
+        {"id": 1, "items": [{"line": 1, "sku": "A1", "qty": 2, "unit": "pc"}, {"line": 2, "sku": "B2", "qty": 1, "unit": "pc"}]},
+        {"id": 2, "items": [{"line": 1, "sku": "C3", "qty": 5, "unit": "pc"}]},
+        {"id": 3, "items": []},
+        {"id": 4, "items": None},
+    ]
+    encoded = zoon.encode(data)
+    # Child rows follow the parent's cells; i+ restarts in every list
+    assert encoded == "# id:i+ items:[@unit=pc line:i+ qty:i sku:s]\n2 2 A1 1 B2\n1 5 C3\n0\n~"
+    assert zoon.decode(encoded) == data
+    assert zoon.decode(encoded, workers=2) == data
+    assert zoon.encode(data, sample=2) == encoded
+
+    # Sub-tables nest, one header inside the other
+    nested = [{"id": 1, "items": [{"sku": "A1", "opts": [{"k": "x"}, {"k": "y"}]}, {"sku": "B2", "opts": []}]},
+              {"id": 2, "items": [{"sku": "A1", "opts": [{"k": "z"}]}]}]
+    encoded = zoon.encode(nested)
+    assert encoded.startswith("# id:i+ items:[opts:[k:s] sku:s]\n")
+    assert zoon.decode(encoded) == nested
+
+    # A string among the numbers of a child column stays one cell
+    mixed = [{"id": 1, "items": [{"x": 1, "y": "p"}, {"x": "a b", "y": "q"}], "tail": "t1"},
+             {"id": 2, "items": [{"x": 2.5, "y": "r"}, {"x": "c", "y": "s"}], "tail": "t2"}]
+    encoded = zoon.encode(mixed)
+    assert encoded == '# id:i+ items:[x:n y:s] tail:s\n2 t1 1 p "a b" q\n2 t2 2.5 r c s'
+    assert zoon.decode(encoded) == mixed
+
+
+def test_string_cells_stay_one_token():
+    # A leading quote or bracket, or an empty string, must not shift the
+    # cells after it; with a sub-table that would misread the child count
+    values = ['" x', "[a", "[a] b", "", 'say "hi"', 'x\\"y']
+    data = [{"id": i + 1, "s": value, "items": [{"k": i, "w": value}], "tail": "t"} for i, value in enumerate(values)]
+    encoded = zoon.encode(data)
+    assert zoon.decode(encoded) == data
+    assert list(zoon.decode_iter(encoded.splitlines())) == data
+    flat = [{"s": value, "n": i} for i, value in enumerate(values * 2)]
+    assert zoon.decode(zoon.encode(flat)) == flat
+
+
+def test_sub_table_header_must_parse_back():
+    # An unbalanced bracket in a child value keeps the column inline
+    data = [{"items": [{"tag": "x]"}, {"tag": "x]"}]}, {"items": [{"tag": "x]"}]}]
+    assert "items:[" not in zoon.encode(data)
@@ -0,0 +1,61 @@
+import pytest
+import zoon
+from zoon import Schema
+
+
+def _batch(n, start_role=0):
+    roles = ["admin", "user", "guest"]
+    return [
+        {"id": i, "name": f"U{i}", "role": roles[(i + start_role) % 3], "active": i % 2 == 0, "org": "acme"}
+        for i in range(1, n + 1)
+    ]
+
+
+def test_inferred_schema_matches_encode():
+    data = _batch(12)
+    schema = Schema.infer(data)
+    encoded = schema.encode(data)
+    assert encoded == zoon.encode(data)
+    assert schema.decode(encoded) == data
+
+
+def test_schema_reused_across_batches():
+    schema = Schema.infer(_batch(12))
+    batch = _batch(7, start_role=1)
+    encoded = schema.encode(batch)
+    assert encoded.startswith(schema.header + "\n")
+    assert zoon.decode(encoded) == batch
+    assert schema.decode(encoded) == batch
+
+
+def test_declared_schema():
+    schema = Schema(
+        {"id": "i+", "name": "s", "role": "!admin|guest|user", "active": "b"},
+        constants={"org": "acme"},
+    )
+    data = _batch(5)
+    encoded = schema.encode(data)
+    assert encoded.split("\n")[0] == "# @org=acme id:i+ name:s role!admin|guest|user active:b"
+    assert zoon.decode(encoded) == data
+
+
+def test_schema_from_header_roundtrip():
+    schema = Schema.infer(_batch(12))
+    assert Schema.from_header(schema.header) == schema
+
+
+def test_schema_mismatch_falls_back_or_raises():
+    schema = Schema.infer(_batch(12))
+    bad = _batch(3)
+    bad[1]["org"] = "other"
+    assert not schema.fits(bad)
+    assert schema.encode(bad) == zoon.encode(bad)
+    with pytest.raises(ValueError):
+        schema.encode(bad, strict=True)
+    with pytest.raises(ValueError):
+        schema.decode(zoon.encode(bad), strict=True)
+
+
+def test_invalid_declaration():
+    with pytest.raises(ValueError):
+        Schema({"id": "x"})
@@ -0,0 +1,92 @@
+import io
+import pytest
+import zoon
+from zoon import encode_iter, encode_to
+
+
+def _rows(n):
+    for i in range(1, n + 1):
+        yield {"id": i, "name": f"User{i}", "role": "admin" if i % 3 == 0 else "user", "active": i % 2 == 0}
+
+
+def test_encode_iter_matches_encode_within_window():
+    data = list(_rows(50))
+    assert "".join(encode_iter(data, window=100, chunk_size=7)) == zoon.encode(data)
+
+
+def test_encode_iter_beyond_window():
+    data = list(_rows(50))
+    encoded = "".join(encode_iter(iter(data), window=10, chunk_size=4))
+    assert zoon.decode(encoded) == data
+
+
+def test_encode_iter_rejects_row_outside_header():
+    data = list(_rows(10)) + [{"id": 11, "name": "X", "role": "user", "active": "yes"}]
+    with pytest.raises(ValueError):
+        "".join(encode_iter(data, window=10))
+
+
+def test_encode_iter_row_count_only():
+    data = ({"id": i, "status": "static"} for i in range(1, 2001))
+    encoded = "".join(encode_iter(data, window=5))
+    assert "+2000" in encoded
+    assert len(zoon.decode(encoded)) == 2000
+
+
+def test_encode_to_writer():
+    buf = io.StringIO()
+    encode_to(_rows(25), buf, window=5, chunk_size=3)
+    assert zoon.decode(buf.getvalue()) == list(_rows(25))
+
+
+def test_auto_increment_must_start_at_one():
+    data = [{"id": 5, "name": "a"}, {"id": 6, "name": "b"}]
+    assert "i+" not in zoon.encode(data)
+    assert zoon.decode(zoon.encode(data)) == data
+
+
+def test_decode_iter_file_object():
+    data = list(_rows(30))
+    rows = zoon.decode_iter(io.StringIO(zoon.encode(data)))
+    assert next(rows) == data[0]
+    assert list(rows) == data[1:]
+
+
+def test_decode_iter_path(tmp_path):
+    data = [
+        {"infrastructure": {"postgres": {"status": "up"}, "redis": {"status": "up"}}},
+        {"infrastructure": {"postgres": {"status": "down"}, "redis": {"status": "down"}}},
+    ]
+    path = tmp_path / "data.zoon"
+    path.write_text(zoon.encode(data))
+    assert list(zoon.decode_iter(path)) == data
+    assert list(zoon.decode_iter(str(path))) == data
+
+
+def test_decode_iter_lines_and_bytes():
+    data = list(_rows(10))
+    encoded = zoon.encode(data)
+    assert list(zoon.decode_iter(encoded.split("\n"))) == data
+    assert list(zoon.decode_iter(io.BytesIO(encoded.encode()))) == data
+
+
+def test_decode_iter_non_tabular():
+    assert list(zoon.decode_iter(["[a,b,c]"])) == zoon.decode("[a,b,c]")
+    assert list(zoon.decode_iter(["name=Alice age:30"])) == [{"name": "Alice", "age": 30}]
+
+
+def test_encode_into_text_and_binary_writers():
+    data = [{"id": i, "tags": ["a", "b"], "meta": {"n": i * 1.5}} for i in range(1, 30)]
+    text = io.StringIO()
+    zoon.encode_into(data, text, chunk_size=4)
+    assert text.getvalue() == zoon.encode(data)
+    raw = io.BytesIO()
+    zoon.encode_into(data, raw, chunk_size=4)
+    assert raw.getvalue() == zoon.encode(data).encode("utf-8")
+    for value in ({"a": 1}, [], [{"s": "x"}] * 3):
+        raw = io.BytesIO()
+        zoon.encode_into(value, raw)
+        assert raw.getvalue().decode("utf-8") == zoon.encode(value)
+    raw = io.BytesIO()
+    encode_to(_rows(5), raw)
+    assert zoon.decode(raw.getvalue()) == list(_rows(5))
@@ -0,0 +1,51 @@
+import pytest
+import zoon
+
+
+def _table(n):
+    return [{"id": i, "name": f"U{i}", "level": ["debug", "info", "warn"][i % 3], "meta": {"score": i / 2}}
+            for i in range(1, n + 1)]
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    path = tmp_path / "table.zoon"
+    lines = zoon.encode(_table(50)).split("\n")
+    lines.insert(10, "  ")
+    path.write_text("\n".join(lines) + "\n\n")
+    return path
+
+
+def test_open_random_access(table_path):
+    data = _table(50)
+    with zoon.open(table_path) as table:
+        assert len(table) == 50
+        assert table[0] == data[0]
+        assert table[-1] == data[-1]
+        assert table[20] == data[20]
+        assert table[5:8] == data[5:8]
+        assert table[::10] == data[::10]
+        with pytest.raises(IndexError):
+            table[50]
+
+
+def test_open_iterates_all_rows(table_path):
+    with zoon.open(table_path) as table:
+        assert list(table) == _table(50)
+        assert table.columns == ["id", "level", "meta.score", "name"]
+
+
+def test_open_row_count_only(tmp_path):
+    path = tmp_path / "count.zoon"
+    data = [{"id": i, "status": "static"} for i in range(1, 6)]
+    path.write_text(zoon.encode(data))
+    with zoon.open(path) as table:
+        assert len(table) == 5
+        assert table[4] == data[4]
+
+
+def test_open_rejects_non_tabular(tmp_path):
+    path = tmp_path / "inline.zoon"
+    path.write_text("name=Alice")
+    with pytest.raises(ValueError):
+        zoon.open(path)
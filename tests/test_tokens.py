@@ -0,0 +1,55 @@
+import pytest
+import zoon
+
+
+def _rows(n):
+    return [{"id": i, "level": ["info", "warn"][i % 2], "message": f"handled request {i * 7}"} for i in range(1, n + 1)]
+
+
+def test_encode_within_budget():
+    rows = _rows(200)
+    full = zoon.count_tokens(zoon.encode(rows))
+    for budget in (40, 100, full - 1, full):
+        text, included = zoon.encode_within(rows, budget)
+        assert zoon.count_tokens(text) <= budget
+        assert text == zoon.encode(rows[:included])
+        assert zoon.count_tokens(zoon.encode(rows[:included + 1])) > budget or included == len(rows)
+    assert zoon.encode(rows, max_tokens=100) == zoon.encode_within(rows, 100)[0]
+
+
+def test_encode_within_custom_tokenizer():
+    words = str.split
+    text, included = zoon.encode_within(_rows(50), 30, tokenizer=words)
+    assert len(words(text)) <= 30 and included > 0
+
+    # Objects with an encode() method (e.g. tiktoken encodings) count its output
+    class Chars:
+        def encode(self, text):
+            return list(text)
+    text, included = zoon.encode_within(_rows(50), 120, tokenizer=Chars())
+    assert len(text) <= 120 and included > 0
+
+
+def test_encode_within_trims_when_pieces_undercount():
+    # Counts more for the joined text than for its pieces, so rows must be
+    # dropped after the incremental pass
+    calls = []
+
+    def joined_costs_more(text):
+        calls.append(text)
+        return len(text) + 3 * text.count("\n") ** 2
+
+    rows = _rows(300)
+    text, included = zoon.encode_within(rows, 4000, tokenizer=joined_costs_more)
+    assert 0 < included < 300 and joined_costs_more(text) <= 4000
+    assert joined_costs_more(zoon.encode(rows[:included + 1])) > 4000
+    assert len(calls) < 320 + 20
+
+
+def test_encode_within_edge_cases():
+    assert zoon.encode_within([], 10) == ("[]", 0)
+    assert zoon.encode_within(_rows(5), 0) == ("", 0)
+    text, included = zoon.encode_within([{"id": i} for i in range(1, 1001)], 10)
+    assert (text, included) == ("# id:i+ +1000\n", 1000)
+    with pytest.raises(TypeError):
+        zoon.encode_within({"a": 1}, 10)